@@ -3,21 +3,38 @@ IFS .lng File Generator
 Generates language files with proper CS/CE block structure
 """
 
-from typing import Dict, Any, List
+import functools
+import itertools
+import os
+from typing import Dict, Any, Callable, Iterator, List, Union
 from pathlib import Path
 
 
 class LNGGenerator:
     """Generator for IFS .lng language files"""
     
+    # Pre-encoded tab prefixes by nesting depth (LU -> View -> Column)
+    _INDENTS = (b'', b'\t', b'\t\t', b'\t\t\t', b'\t\t\t\t')
+    
+    # Precompiled line templates: (indent, value)
+    _CS_LU = b'%sCS:%s^LU^Logical Unit^N^N\r\n'
+    _CS_VIEW = b'%sCS:%s^LU^View^N^N\r\n'
+    _CS_COL = b'%sCS:%s^LU^Column^N^N\r\n'
+    _A_PROMPT = b'%s\tA:Prompt^%s^\r\n'
+    _CE = b'%sCE:\r\n'
+    
     def __init__(self, module: str, layer: str, main_type: str = "LU", sub_type: str = "Logical Unit"):
         self.module = module
         self.layer = layer
         self.main_type = main_type
         self.sub_type = sub_type
+        self._header_cache = None
         
     def generate_header(self) -> str:
-        """Generate .lng file header"""
+        """Generate .lng file header (built once per generator)"""
+        if self._header_cache is not None:
+            return self._header_cache
+        
         header = [
             "-------------------------------------------------------",
             "File Type: IFS Foundation Language File",
@@ -30,7 +47,8 @@ class LNGGenerator:
             "Content: ",
             "-------------------------------------------------------"
         ]
-        return '\r\n'.join(header) + '\r\n'
+        self._header_cache = '\r\n'.join(header) + '\r\n'
+        return self._header_cache
     
     def generate_content(self, data: Dict[str, Any]) -> str:
         """
@@ -42,99 +60,84 @@ class LNGGenerator:
         Returns:
             Complete .lng file content as string
         """
-        lines = []
-        
-        # Process each logical unit
-        for lu_id, lu_data in data['logical_units'].items():
-            lu_lines = self._generate_lu_block(lu_data, indent_level=0)
-            lines.extend(lu_lines)
+        return b''.join(self.iter_content(data)).decode('utf-8')
+    
+    def iter_content(self, data: Dict[str, Any]) -> Iterator[bytes]:
+        """
+        Yield UTF-8 encoded .lng file content one Logical Unit block at a time
         
-        return ''.join(lines)
+        Args:
+            data: Parsed and filtered data structure
+            
+        Yields:
+            Content chunk for each logical unit
+        """
+        # One output list reused across LUs; emitters get its bound append
+        out: List[bytes] = []
+        append = out.append
+        for lu_data in data['logical_units'].values():
+            self._generate_lu_block(lu_data, 0, append)
+            yield b''.join(out)
+            out.clear()
     
-    def _generate_lu_block(self, lu_data: Dict[str, Any], indent_level: int) -> List[str]:
+    def _generate_lu_block(self, lu_data: Dict[str, Any], indent_level: int, append: Callable[[bytes], None]):
         """Generate CS/CE block for a Logical Unit"""
-        lines = []
-        indent = '\t' * indent_level
+        indent = self._INDENTS[indent_level]
         
         # CS line for LU
-        lu_name = lu_data['name']
-        lines.append(f"{indent}CS:{lu_name}^LU^Logical Unit^N^N\r\n")
+        append(self._CS_LU % (indent, lu_data['name'].encode('utf-8')))
         
         # A:Prompt for LU
-        lu_label = lu_data['label']
-        lines.append(f"{indent}\tA:Prompt^{lu_label}^\r\n")
+        append(self._A_PROMPT % (indent, lu_data['label'].encode('utf-8')))
         
         # Process views
-        for view_id, view_data in lu_data['views'].items():
-            view_lines = self._generate_view_block(view_data, indent_level + 1)
-            lines.extend(view_lines)
+        for view_data in lu_data['views'].values():
+            self._generate_view_block(view_data, indent_level + 1, append)
         
         # CE line for LU
-        lines.append(f"{indent}CE:\r\n")
-        
-        return lines
+        append(self._CE % indent)
     
-    def _generate_view_block(self, view_data: Dict[str, Any], indent_level: int) -> List[str]:
+    def _generate_view_block(self, view_data: Dict[str, Any], indent_level: int, append: Callable[[bytes], None]):
         """Generate CS/CE block for a View"""
-        lines = []
-        indent = '\t' * indent_level
+        indent = self._INDENTS[indent_level]
         
         # CS line for View
-        view_control = view_data['control']
-        lines.append(f"{indent}CS:{view_control}^LU^View^N^N\r\n")
+        append(self._CS_VIEW % (indent, view_data['control'].encode('utf-8')))
         
-        # Process columns (only custom fields)
-        for col_id, col_data in view_data['columns'].items():
-            if col_data['is_custom']:
-                col_lines = self._generate_column_block(col_data, indent_level + 1)
-                lines.extend(col_lines)
+        # Process columns (only custom fields are stored); lookups hoisted out of the loop
+        col_indent = self._INDENTS[indent_level + 1]
+        cs_col, a_prompt, col_end = self._CS_COL, self._A_PROMPT, self._CE % col_indent
+        for col_control, col_label in zip(view_data['col_controls'], view_data['col_labels']):
+            append(cs_col % (col_indent, col_control.encode('utf-8')))
+            append(a_prompt % (col_indent, col_label.encode('utf-8')))
+            append(col_end)
         
         # CE line for View
-        lines.append(f"{indent}CE:\r\n")
-        
-        return lines
-    
-    def _generate_column_block(self, col_data: Dict[str, Any], indent_level: int) -> List[str]:
-        """Generate CS/CE block for a Column"""
-        lines = []
-        indent = '\t' * indent_level
-        
-        # CS line for Column
-        col_control = col_data['control']
-        lines.append(f"{indent}CS:{col_control}^LU^Column^N^N\r\n")
-        
-        # A:Prompt for Column
-        col_label = col_data['label']
-        lines.append(f"{indent}\tA:Prompt^{col_label}^\r\n")
-        
-        # CE line for Column
-        lines.append(f"{indent}CE:\r\n")
-        
-        return lines
+        append(self._CE % indent)
     
-    def generate_file(self, data: Dict[str, Any], output_path: str) -> str:
+    def generate_file(self, data: Dict[str, Any], output_path: Union[str, Path]) -> str:
         """
         Generate complete .lng file
         
         Args:
             data: Parsed and filtered data structure
-            output_path: Path to write the file
+            output_path: Path to write the file (its directory must already exist)
             
         Returns:
             Path to generated file
         """
-        header = self.generate_header()
-        content = self.generate_content(data)
-        
-        full_content = header + content
-        
-        output_file = Path(output_path)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_file, 'w', encoding='utf-8', newline='') as f:
-            f.write(full_content)
-        
-        return str(output_file)
+        # Content is already encoded with CRLF line endings: write it raw, bypassing
+        # TextIOWrapper/BufferedWriter, in as few write(2) calls as the OS allows
+        header = self.generate_header().encode('utf-8')
+        payload = memoryview(b''.join(itertools.chain((header,), self.iter_content(data))))
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            while payload:
+                payload = payload[os.write(fd, payload):]
+        finally:
+            os.close(fd)
+        
+        return str(output_path)
     
     def merge_with_existing(self, new_data: Dict[str, Any], existing_file: str) -> Dict[str, Any]:
         """
@@ -152,7 +155,9 @@ class LNGGenerator:
         # This is a simplified version since we're creating new files
         return new_data
     
-    def get_file_name(self, module: str, layer: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def get_file_name(module: str, layer: str) -> str:
         """
         Get standard file name for .lng file
         
@@ -181,13 +186,9 @@ if __name__ == '__main__':
                     'TEST_VIEW': {
                         'control': 'TEST_VIEW',
                         'label': 'Test View',
-                        'columns': {
-                            'C_TEST_FIELD': {
-                                'control': 'C_TEST_FIELD',
-                                'label': 'Test Field',
-                                'is_custom': True
-                            }
-                        }
+                        'col_ids': ['TestLU.TEST_VIEW.C_TEST_FIELD'],
+                        'col_controls': ['C_TEST_FIELD'],
+                        'col_labels': ['Test Field']
                     }
                 }
             }
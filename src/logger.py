@@ -3,7 +3,9 @@ IFS Language Automation Logger
 Logs all actions, decisions, and skip reasons
 """
 
-from datetime import datetime
+import os
+import sys
+import time
 from pathlib import Path
 from typing import List, Dict, Any
 
@@ -14,13 +16,27 @@ class IFSLogger:
     def __init__(self, log_file: str = "Log.txt"):
         self.log_file = Path(log_file)
         self.entries = []
+        # Entry counts per level, maintained by log() for get_summary()
+        self._counts = {'INFO': 0, 'WARN': 0, 'ERROR': 0, 'SUCCESS': 0}
+        # Formatted timestamp, reused for every entry logged within the same second
+        self._last_ts_second = 0
+        self._last_ts_str = ''
         
     def log(self, message: str, level: str = "INFO"):
         """Log a message with timestamp"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        entry = f"[{timestamp}] [{level}] {message}"
+        entry = f"[{self._timestamp()}] [{level}] {message}"
         self.entries.append(entry)
-        print(entry)  # Also print to console
+        self._counts[level] = self._counts.get(level, 0) + 1
+        # Also echo to console; sys.stdout is looked up per call so later redirection is honoured
+        sys.stdout.write(entry + '\n')
+        
+    def _timestamp(self) -> str:
+        """Current local time as 'YYYY-MM-DD HH:MM:SS', formatted at most once per second"""
+        second = int(time.time())
+        if second != self._last_ts_second:
+            self._last_ts_second = second
+            self._last_ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+        return self._last_ts_str
         
     def info(self, message: str):
         """Log info message"""
@@ -86,35 +102,38 @@ class IFSLogger:
     def write_to_file(self):
         """Write all log entries to file"""
         try:
-            # Read existing content if file exists
-            existing_content = ""
-            if self.log_file.exists():
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    existing_content = f.read()
+            # Only the last byte of an existing log is needed to place the separator
+            existing_size = self.log_file.stat().st_size if self.log_file.exists() else 0
+            ends_with_newline = True
+            if existing_size:
+                with open(self.log_file, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    ends_with_newline = f.read(1) == b'\n'
             
             # Append new entries
-            with open(self.log_file, 'w', encoding='utf-8') as f:
-                if existing_content:
-                    f.write(existing_content)
-                    if not existing_content.endswith('\n'):
+            with open(self.log_file, 'a', encoding='utf-8', buffering=1 << 16) as f:
+                if existing_size:
+                    if not ends_with_newline:
                         f.write('\n')
                     f.write('\n')  # Extra blank line
                 
-                f.write(f"=== Automation Run: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n")
-                for entry in self.entries:
-                    f.write(entry + '\n')
+                f.write(f"=== Automation Run: {self._timestamp()} ===\n")
+                if self.entries:
+                    f.write('\n'.join(self.entries))
+                    f.write('\n')
                 f.write('\n')
                 
             self.success(f"Log written to {self.log_file}")
             
         except Exception as e:
             self.error(f"Failed to write log file: {e}")
+        
+        sys.stdout.flush()
             
     def get_summary(self) -> str:
         """Get a summary of the log"""
-        info_count = sum(1 for e in self.entries if '[INFO]' in e)
-        warn_count = sum(1 for e in self.entries if '[WARN]' in e)
-        error_count = sum(1 for e in self.entries if '[ERROR]' in e)
-        success_count = sum(1 for e in self.entries if '[SUCCESS]' in e)
-        
-        return f"Log Summary: {info_count} info, {warn_count} warnings, {error_count} errors, {success_count} success"
+        counts = self._counts
+        return (
+            f"Log Summary: {counts['INFO']} info, {counts['WARN']} warnings, "
+            f"{counts['ERROR']} errors, {counts['SUCCESS']} success"
+        )
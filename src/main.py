@@ -20,18 +20,24 @@ class IFSLanguageAutomation:
     """Main automation orchestrator"""
     
     def __init__(self, xml_path: str, output_dir: str = None, languages: List[str] = None, 
-                 translation_backend: str = 'dictionary', api_key: str = None):
+                 translation_backend: str = 'dictionary', api_key: str = None,
+                 cache_path: str = None, use_cache: bool = True, refresh_cache: bool = False):
         self.xml_path = Path(xml_path)
         self.output_dir = Path(output_dir) if output_dir else self.xml_path.parent
+        # Created once here; generators and the logger write into it directly
+        self.output_dir.mkdir(parents=True, exist_ok=True)
         self.languages = languages or ['sv-SE', 'nb-NO']
         
         # Initialize components
         self.logger = IFSLogger(self.output_dir / 'Log.txt')
-        self.parser = IFSXMLParser(self.xml_path)
+        self.parser = IFSXMLParser(self.xml_path, custom_only=True)
         self.translator = IFSTranslator(
             backend=translation_backend,
             api_key=api_key,
             dictionary_dir=self.xml_path.parent,
+            cache_path=cache_path,
+            use_persistent_cache=use_cache,
+            refresh_cache=refresh_cache,
         )
         self.validator = IFSValidator()
         
@@ -40,6 +46,10 @@ class IFSLanguageAutomation:
         self.custom_data = None
         self.translations = {}
         
+        # Generators created during generation, reused for validation
+        self._lng_generator = None
+        self._trs_generators = {}
+        
     def run(self):
         """Execute the complete automation workflow"""
         try:
@@ -87,6 +97,9 @@ class IFSLanguageAutomation:
             self.logger.write_to_file()
             print(f"\nERROR: {e}")
             sys.exit(1)
+        finally:
+            # Release the translation cache and backend HTTP connections
+            self.translator.close()
     
     def _parse_xml(self):
         """Step 1: Parse XML file"""
@@ -95,30 +108,30 @@ class IFSLanguageAutomation:
         if not self.xml_path.exists():
             raise FileNotFoundError(f"XML file not found: {self.xml_path}")
         
+        # Parser filters to custom fields and collects statistics in the same pass
         self.parsed_data = self.parser.parse()
-        stats = self.parser.get_statistics(self.parsed_data)
         
-        self.logger.log_parsing_complete(stats)
+        self.logger.log_parsing_complete(self.parser.stats)
     
     def _extract_custom_fields(self):
         """Step 2: Extract custom fields (C_* only)"""
         self.logger.info("Extracting custom fields (C_* prefix only)")
         
-        self.custom_data = self.parser.extract_custom_fields(self.parsed_data)
+        # Already filtered during parsing (custom_only=True)
+        self.custom_data = self.parsed_data
         
         # Count custom fields
         custom_count = 0
         for lu_data in self.custom_data['logical_units'].values():
             for view_data in lu_data['views'].values():
-                for col_id, col_data in view_data['columns'].items():
+                for col_control, col_label in zip(view_data['col_controls'], view_data['col_labels']):
                     custom_count += 1
-                    self.logger.log_field_processed(col_id, col_data['label'])
+                    self.logger.log_field_processed(col_control, col_label)
         
         self.logger.success(f"Extracted {custom_count} custom fields")
         
         # Log skipped standard fields
-        stats = self.parser.get_statistics(self.parsed_data)
-        skipped_count = stats['standard_columns']
+        skipped_count = self.parser.stats['standard_columns']
         if skipped_count > 0:
             self.logger.info(f"Skipped {skipped_count} standard fields (non-C_* prefix)")
     
@@ -128,26 +141,30 @@ class IFSLanguageAutomation:
         layer = self.custom_data['layer']
         
         generator = LNGGenerator(module, layer)
+        self._lng_generator = generator
         file_name = generator.get_file_name(module, layer)
         output_path = self.output_dir / file_name
         
         self.logger.info(f"Generating .lng file: {file_name}")
         
-        generated_file = generator.generate_file(self.custom_data, str(output_path))
+        generated_file = generator.generate_file(self.custom_data, output_path)
         
         self.logger.log_file_generation(generated_file, "Created")
         self.logger.success(f"Generated .lng file: {file_name}")
     
     def _translate_labels(self):
         """Step 4: Translate labels to all target languages"""
-        # Collect all unique labels
-        labels = set()
-        for lu_data in self.custom_data['logical_units'].values():
-            for view_data in lu_data['views'].values():
-                for col_data in view_data['columns'].values():
-                    labels.add(col_data['label'])
+        # Unique labels were collected by the parser in its single pass
+        labels_list = sorted(self.parser.unique_labels)
         
-        labels_list = sorted(list(labels))
+        # Network backends: overlap per-language round trips
+        if self.translator.backend in self.translator.NETWORK_BACKENDS and len(self.languages) > 1:
+            for language in self.languages:
+                self.logger.log_translation_start(language, len(labels_list))
+            self.translations.update(self.translator.translate_batch_multilang(labels_list, self.languages))
+            for language in self.languages:
+                self.logger.log_translation_complete(language)
+            return
         
         # Translate to each language
         for language in self.languages:
@@ -165,13 +182,14 @@ class IFSLanguageAutomation:
         
         for language in self.languages:
             generator = TRSGenerator(module, layer, language)
+            self._trs_generators[language] = generator
             file_name = generator.get_file_name(module, layer, language)
             output_path = self.output_dir / file_name
             
             self.logger.info(f"Generating .trs file: {file_name}")
             
             translations = self.translations[language]
-            generated_file = generator.generate_file(self.custom_data, translations, str(output_path))
+            generated_file = generator.generate_file(self.custom_data, translations, output_path)
             
             self.logger.log_file_generation(generated_file, "Created")
             self.logger.success(f"Generated .trs file: {file_name}")
@@ -182,13 +200,12 @@ class IFSLanguageAutomation:
         layer = self.custom_data['layer']
         
         # Validate .lng file
-        lng_generator = LNGGenerator(module, layer)
-        lng_file = self.output_dir / lng_generator.get_file_name(module, layer)
+        lng_file = self.output_dir / self._lng_generator.get_file_name(module, layer)
         self._validate_single_file(lng_file)
         
         # Validate .trs files
         for language in self.languages:
-            trs_generator = TRSGenerator(module, layer, language)
+            trs_generator = self._trs_generators[language]
             trs_file = self.output_dir / trs_generator.get_file_name(module, layer, language)
             self._validate_single_file(trs_file)
     
@@ -247,6 +264,23 @@ def main():
         help='API key for groq or google (can also use GROQ_API_KEY or GOOGLE_API_KEY env var)'
     )
     
+    parser.add_argument(
+        '--cache-path',
+        help='SQLite cache for groq/google translations (default: ~/.cache/ifs_translator/cache.sqlite)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write the groq/google translation cache'
+    )
+    
+    parser.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        help='Re-translate every label with groq/google and overwrite its cached translation'
+    )
+    
     parser.add_argument(
         '--validate-only',
         action='store_true',
@@ -278,7 +312,10 @@ def main():
             output_dir=args.output_dir,
             languages=languages,
             translation_backend=args.backend,
-            api_key=args.api_key
+            api_key=args.api_key,
+            cache_path=args.cache_path,
+            use_cache=not args.no_cache,
+            refresh_cache=args.refresh_cache
         )
         automation.run()
 
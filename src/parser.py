@@ -3,103 +3,238 @@ IFS TranslatableResources XML Parser
 Extracts custom fields (C_* prefix) from XML files
 """
 
-import xml.etree.ElementTree as ET
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+# Prefer lxml (libxml2) when installed; fall back to the standard library
+try:
+    from lxml import etree as ET
+    # lxml < 5.0 resolves external entities by default and lacks resolve_entities='internal'
+    if ET.LXML_VERSION < (5, 0):
+        raise ImportError("lxml >= 5.0 required")
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+
 
 class IFSXMLParser:
     """Parser for IFS TranslatableResources XML files"""
     
     NAMESPACE = {'ifs': 'types.scan.translation.fnd.ifsworld.com'}
     
-    def __init__(self, xml_path: str):
+    # Fully-qualified tags, compared by equality instead of substring search
+    _NS_PREFIX = '{%s}' % NAMESPACE['ifs']
+    TRANSLATABLE_RESOURCE_TAG = _NS_PREFIX + 'TranslatableResource'  # Logical Unit
+    RESOURCE_TAG = _NS_PREFIX + 'Resource'  # View or Column
+    TEXT_TAG = _NS_PREFIX + 'Text'  # Resource's CDATA label
+    
+    # Control name prefixes that mark a column as customized
+    CUSTOM_PREFIXES = ('C_',)
+    
+    def __init__(self, xml_path: str, custom_only: bool = False):
+        """
+        Args:
+            xml_path: Path to TranslatableResources XML file
+            custom_only: If True, drop standard columns (and views/LUs left
+                         without custom columns) while parsing, so the result of
+                         parse() is already filtered like extract_custom_fields()
+        """
         self.xml_path = Path(xml_path)
-        self.tree = None
+        self.custom_only = custom_only
         self.root = None
+        self.stats = self._empty_statistics()
+        # Distinct labels of all custom columns, collected by parse()
+        self.unique_labels = set()
         
     def parse(self) -> Dict[str, Any]:
         """
         Parse XML file and extract structure
         
+        Statistics for the whole document (including skipped standard columns)
+        are collected during the same pass and stored in self.stats; distinct
+        custom column labels are stored in self.unique_labels.
+        
         Returns:
             Dictionary containing module, layer, and logical unit hierarchy
         """
-        self.tree = ET.parse(self.xml_path)
-        self.root = self.tree.getroot()
+        # A repeated LU ID replaces the earlier LU in place, so statistics are
+        # kept per ID and summed once the document is read
+        logical_units = {}
+        lu_counts = {}
+        
+        # Process each TranslatableResource (Logical Unit) once fully read
+        for lu_elem in self._iter_top_level_elements():
+            if lu_elem.tag == self.TRANSLATABLE_RESOURCE_TAG:
+                lu_id = lu_elem.get('ID')
+                logical_units[lu_id], lu_counts[lu_id] = self._parse_logical_unit(lu_elem)
+        
+        stats = self._empty_statistics()
+        stats['total_logical_units'] = len(lu_counts)
+        for view_count, custom_count, standard_count in lu_counts.values():
+            stats['total_views'] += view_count
+            stats['total_columns'] += custom_count + standard_count
+            stats['custom_columns'] += custom_count
+            stats['standard_columns'] += standard_count
+        self.stats = stats
+        
+        # LUs dropped by custom_only keep their place as None until here
+        logical_units = {lu_id: lu_data for lu_id, lu_data in logical_units.items() if lu_data is not None}
+        
+        # Labels of the views that were kept, not of views replaced by a later repeat
+        self.unique_labels = {
+            label
+            for lu_data in logical_units.values()
+            for view_data in lu_data['views'].values()
+            for label in view_data['col_labels']
+        }
         
         # Extract root attributes
-        result = {
+        return {
             'type': self.root.get('type'),
             'module': self.root.get('module'),
             'version': self.root.get('version'),
             'layer': self.root.get('layer'),
-            'logical_units': {}
+            'logical_units': logical_units
         }
+    
+    def _iter_top_level_elements(self) -> Iterator[ET.Element]:
+        """
+        Stream the document, yielding each fully-read child of the root element.
         
-        # Process each TranslatableResource (Logical Unit)
-        # Use .// to search recursively and handle any namespace
-        for lu_elem in self.root:
-            if 'TranslatableResource' in lu_elem.tag:
-                lu_data = self._parse_logical_unit(lu_elem)
-                if lu_data:
-                    lu_id = lu_elem.get('ID')
-                    result['logical_units'][lu_id] = lu_data
+        Each subtree is released after the caller has processed it, so only one
+        Logical Unit is held in memory at a time. Sets self.root.
+        """
+        if HAS_LXML:
+            # libxml2 dispatches only TranslatableResource end events
+            context = ET.iterparse(
+                str(self.xml_path), events=('end',), tag=self.TRANSLATABLE_RESOURCE_TAG,
+                remove_comments=True, remove_pis=True,
+                # Like xml.etree: expand internal entities, never load external ones (file:// etc.)
+                resolve_entities='internal'
+            )
+            for event, elem in context:
+                parent = elem.getparent()
+                if parent is None or parent.getparent() is not None:
+                    continue
+                yield elem
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
+            self.root = context.root
+            return
         
-        return result
+        depth = 0
+        for event, elem in ET.iterparse(self.xml_path, events=('start', 'end')):
+            if event == 'start':
+                if depth == 0:
+                    self.root = elem
+                depth += 1
+                continue
+            
+            depth -= 1
+            if depth == 1:
+                yield elem
+                elem.clear()
+                self.root.remove(elem)
     
-    def _parse_logical_unit(self, lu_elem: ET.Element) -> Dict[str, Any]:
-        """Parse a Logical Unit element"""
+    def _parse_logical_unit(self, lu_elem: ET.Element) -> Tuple[Optional[Dict[str, Any]], Tuple[int, int, int]]:
+        """
+        Parse a Logical Unit element
+        
+        Returns:
+            Tuple of (LU data, or None if custom_only and no custom views;
+            (views, custom columns, standard columns) counted over the final views)
+        """
+        # A repeated view control replaces the earlier view in place, as in the
+        # unfiltered parse; views dropped by custom_only keep their place as None
+        views = {}
+        standard_counts = {}
+        
+        # Process views - iterate through all children
+        resource_tag = self.RESOURCE_TAG
+        for child in lu_elem:
+            if child.tag == resource_tag and child.get('subtype') == 'View':
+                view_id = child.get('control')
+                views[view_id], standard_counts[view_id] = self._parse_view(child)
+        
+        custom_count = sum(len(view_data['col_controls']) for view_data in views.values() if view_data)
+        counts = (len(views), custom_count, sum(standard_counts.values()))
+        
         lu_data = {
             'id': lu_elem.get('ID'),
             'name': lu_elem.get('name'),
             'type': lu_elem.get('type'),
             'label': self._get_text(lu_elem),
-            'views': {}
+            'views': {view_id: view_data for view_id, view_data in views.items() if view_data is not None}
         }
         
-        # Process views - iterate through all children
-        for child in lu_elem:
-            if 'Resource' in child.tag and child.get('subtype') == 'View':
-                view_data = self._parse_view(child)
-                if view_data:
-                    view_id = child.get('control')
-                    lu_data['views'][view_id] = view_data
+        # Only include LU if it has custom fields
+        if self.custom_only and not lu_data['views']:
+            return None, counts
         
-        return lu_data
+        return lu_data, counts
     
-    def _parse_view(self, view_elem: ET.Element) -> Dict[str, Any]:
-        """Parse a View element"""
+    def _parse_view(self, view_elem: ET.Element) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Parse a View element; returns (view data or None if custom_only and no custom columns, standard column count)"""
+        # Custom columns are stored as parallel lists (struct of arrays)
+        col_ids: List[str] = []
+        col_controls: List[str] = []
+        col_labels: List[str] = []
         view_data = {
             'id': view_elem.get('ID'),
             'control': view_elem.get('control'),
             'label': self._get_text(view_elem),
-            'columns': {}
+            'col_ids': col_ids,
+            'col_controls': col_controls,
+            'col_labels': col_labels
         }
         
+        # Standard columns are only tracked by control name
+        standard_columns = set()
+        # Position of each custom control, so a repeated control replaces the earlier entry
+        positions: Dict[str, int] = {}
+        
+        # Hoisted lookups for the per-column loop
+        _starts = str.startswith
+        custom_prefixes = self.CUSTOM_PREFIXES
+        add_standard = standard_columns.add
+        resource_tag = self.RESOURCE_TAG
+        
         # Process columns - iterate through all children
         for child in view_elem:
-            if 'Resource' in child.tag and child.get('subtype') == 'Column':
+            if child.tag == resource_tag and child.get('subtype') == 'Column':
                 col_control = child.get('control')
-                col_label = self._get_text(child)
+                if not _starts(col_control, custom_prefixes):
+                    add_standard(col_control)
+                    continue
                 
-                # Store all columns (filtering happens later)
-                view_data['columns'][col_control] = {
-                    'id': child.get('ID'),
-                    'control': col_control,
-                    'label': col_label,
-                    'is_custom': col_control.startswith('C_')
-                }
-        
-        return view_data
+                col_label = self._get_text(child)
+                pos = positions.get(col_control)
+                if pos is None:
+                    positions[col_control] = len(col_controls)
+                    col_ids.append(child.get('ID'))
+                    col_controls.append(col_control)
+                    col_labels.append(col_label)
+                else:
+                    col_ids[pos] = child.get('ID')
+                    col_labels[pos] = col_label
+        
+        standard_count = len(standard_columns)
+        if self.custom_only:
+            if not col_controls:
+                return None, standard_count
+        else:
+            view_data['standard_columns'] = standard_columns
+        
+        return view_data, standard_count
     
     def _get_text(self, elem: ET.Element) -> str:
         """Extract text from CDATA section"""
-        # Find Text element - iterate through children
-        for child in elem:
-            if 'Text' in child.tag:
-                if child.text:
-                    return child.text.strip()
+        # Direct child Text element, matched in C by ElementTree
+        text_elem = elem.find(self.TEXT_TAG)
+        if text_elem is not None and text_elem.text:
+            return text_elem.text.strip()
         return ''
     
     def extract_custom_fields(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -130,19 +265,15 @@ class IFSXMLParser:
             }
             
             for view_id, view_data in lu_data['views'].items():
-                # Filter columns to only custom fields
-                custom_columns = {
-                    col_id: col_data
-                    for col_id, col_data in view_data['columns'].items()
-                    if col_data['is_custom']
-                }
-                
-                if custom_columns:
+                # Only custom columns are stored in the column lists
+                if view_data['col_controls']:
                     filtered_lu['views'][view_id] = {
                         'id': view_data['id'],
                         'control': view_data['control'],
                         'label': view_data['label'],
-                        'columns': custom_columns
+                        'col_ids': view_data['col_ids'],
+                        'col_controls': view_data['col_controls'],
+                        'col_labels': view_data['col_labels']
                     }
             
             # Only include LU if it has custom fields
@@ -151,26 +282,31 @@ class IFSXMLParser:
         
         return result
     
-    def get_statistics(self, parsed_data: Dict[str, Any]) -> Dict[str, int]:
-        """Get statistics about parsed data"""
-        stats = {
+    @staticmethod
+    def _empty_statistics() -> Dict[str, int]:
+        """Return a zeroed statistics dictionary"""
+        return {
             'total_logical_units': 0,
             'total_views': 0,
             'total_columns': 0,
             'custom_columns': 0,
             'standard_columns': 0
         }
+    
+    def get_statistics(self, parsed_data: Dict[str, Any]) -> Dict[str, int]:
+        """Get statistics about parsed data"""
+        stats = self._empty_statistics()
         
         for lu_data in parsed_data['logical_units'].values():
             stats['total_logical_units'] += 1
             for view_data in lu_data['views'].values():
                 stats['total_views'] += 1
-                for col_data in view_data['columns'].values():
-                    stats['total_columns'] += 1
-                    if col_data['is_custom']:
-                        stats['custom_columns'] += 1
-                    else:
-                        stats['standard_columns'] += 1
+                # Custom columns in the column lists, standard ones by name only (see _parse_view)
+                custom_count = len(view_data['col_controls'])
+                standard_count = len(view_data.get('standard_columns', ()))
+                stats['total_columns'] += custom_count + standard_count
+                stats['custom_columns'] += custom_count
+                stats['standard_columns'] += standard_count
         
         return stats
 
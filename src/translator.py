@@ -4,14 +4,172 @@ Supports: Groq (free), Google Translate (free tier), and fallback dictionary
 """
 
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Union
+import functools
 import json
 import os
+import re
+import sqlite3
+import threading
+
+# Prefer orjson (C parser) for dictionary files and Groq replies when installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Default location of the persistent cache for network backend translations
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'ifs_translator' / 'cache.sqlite'
+
+# Built-in terms used when no project dictionary_dir is set (read-only)
+_SV_TERMS = MappingProxyType({
+    'Branch No': 'Filialnummer',
+    'EAN': 'EAN',
+    'Technical Description': 'Teknisk beskrivning',
+    'Sales UOM': 'Försäljnings-enhet',
+    'Package Measurement': 'Paketmått',
+    'Min Order Qty': 'Min orderkvantitet',
+    'List Price': 'Listpris',
+    'Discount (%)': 'Rabatt (%)',
+    'Stored Article': 'Lagrad artikel',
+    'Product URL': 'Produkt-URL',
+    'Account Reference': 'Kontoreferens',
+    'Security Sheet': 'Säkerhetsdatablad',
+    'Environmental Classification': 'Miljöklassificering',
+    'Cross Reference': 'Korsreferens',
+    "Supplier's Product Category 2": 'Leverantörens produktkategori 2',
+    'Statistic Group': 'Statistikgrupp',
+    'Part Synonym': 'Artikelsynonym',
+    'Environmental Details': 'Miljödetaljer',
+    'C Actual Cost': 'Verklig kostnad',
+    'C Actual Revenue': 'Verklig intäkt',
+    'Actual Cost': 'Verklig kostnad',
+    'Actual Revenue': 'Verklig intäkt'
+})
+_NB_TERMS = MappingProxyType({
+    'Branch No': 'Filialnummer',
+    'EAN': 'EAN',
+    'Technical Description': 'Teknisk beskrivelse',
+    'Sales UOM': 'Salgsenhet',
+    'Package Measurement': 'Pakkemål',
+    'Min Order Qty': 'Min bestillingsmengde',
+    'List Price': 'Listepris',
+    'Discount (%)': 'Rabatt (%)',
+    'Stored Article': 'Lagret artikkel',
+    'Product URL': 'Produkt-URL',
+    'Account Reference': 'Kontoreferanse',
+    'Security Sheet': 'Sikkerhetsdatablad',
+    'Environmental Classification': 'Miljøklassifisering',
+    'Cross Reference': 'Kryssreferanse',
+    "Supplier's Product Category 2": 'Leverandørens produktkategori 2',
+    'Statistic Group': 'Statistikkgruppe',
+    'Part Synonym': 'Artikkelsynonym',
+    'Environmental Details': 'Miljødetaljer',
+    'C Actual Cost': 'Faktisk kostnad',
+    'C Actual Revenue': 'Faktisk inntekt',
+    'Actual Cost': 'Faktisk kostnad',
+    'Actual Revenue': 'Faktisk inntekt'
+})
+_NO_TERMS = MappingProxyType({})
+_BUILTIN_TERMS = {'sv-SE': _SV_TERMS, 'nb-NO': _NB_TERMS}
+
+# Labels kept as-is instead of being sent to a network backend: acronyms and
+# all-caps/numeric codes such as "EAN", "UOM", "GTIN-13" or "2024" (and so also
+# all-caps phrases such as "ACTUAL COST")
+_PASSTHROUGH_RE = re.compile(r'[A-Z0-9][A-Z0-9 _./()-]*')
+
+
+class PersistentTranslationCache:
+    """SQLite-backed (language, source text) -> translation store shared across runs"""
+    
+    # Stay below SQLITE_MAX_VARIABLE_NUMBER (999 on older SQLite builds)
+    _QUERY_CHUNK = 500
+    
+    def __init__(self, path: Union[Path, str]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Languages may be translated from worker threads; access is serialized by the lock
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS t (lang TEXT, src TEXT, dst TEXT, PRIMARY KEY (lang, src))"
+            )
+    
+    def get_many(self, lang: str, texts: List[str]) -> Dict[str, str]:
+        """Return cached translations for those texts that have one"""
+        found = {}
+        with self._lock:
+            for i in range(0, len(texts), self._QUERY_CHUNK):
+                chunk = texts[i:i + self._QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT src, dst FROM t WHERE lang = ? AND src IN ({placeholders})",
+                    [lang, *chunk]
+                )
+                found.update(rows)
+        return found
+    
+    def put_many(self, lang: str, translations: Dict[str, str]):
+        """Store translations in a single transaction"""
+        if not translations:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO t (lang, src, dst) VALUES (?, ?, ?)",
+                [(lang, src, dst) for src, dst in translations.items()]
+            )
+    
+    def close(self):
+        """Commit and close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+
+
+def _persistent_cached(backend_request):
+    """
+    Wrap a backend request method (texts, target_language) -> translations so that
+    texts already in the translator's persistent cache are not sent again and new
+    results are stored (with refresh_cache, cached entries are ignored and overwritten).
+    Fallback results never pass through here, so they are not cached.
+    """
+    @functools.wraps(backend_request)
+    def wrapper(self, texts: List[str], target_language: str) -> Dict[str, str]:
+        cache = self.persistent_cache
+        if cache is None:
+            return backend_request(self, texts, target_language)
+        
+        translations = {} if self.refresh_cache else cache.get_many(target_language, texts)
+        missing = [text for text in texts if text not in translations]
+        if missing:
+            new_translations = backend_request(self, missing, target_language)
+            cache.put_many(target_language, new_translations)
+            translations.update(new_translations)
+        return translations
+    
+    return wrapper
 
 
 class IFSTranslator:
     """AI-powered translator for IFS labels with multiple backend support"""
     
+    # Backends whose requests are network-bound, so languages can be translated concurrently
+    NETWORK_BACKENDS = ('groq', 'google')
+    
+    # Maximum number of labels sent per backend request
+    GROQ_BATCH_SIZE = 50
+    GOOGLE_BATCH_SIZE = 100
+    
+    # Maximum number of in-memory cached translations per language (least recently used are evicted)
+    CACHE_MAX_ENTRIES = 10_000
+    
     # Language mappings
     LANGUAGE_NAMES = {
         'sv-SE': 'Swedish',
@@ -27,7 +185,9 @@ class IFSTranslator:
         'pl-PL': 'Polish'
     }
     
-    def __init__(self, backend='dictionary', api_key=None, dictionary_dir: Optional[Union[Path, str]] = None):
+    def __init__(self, backend='dictionary', api_key=None, dictionary_dir: Optional[Union[Path, str]] = None,
+                 cache_path: Optional[Union[Path, str]] = None, use_persistent_cache: bool = True,
+                 refresh_cache: bool = False):
         """
         Initialize translator with specified backend
         
@@ -37,17 +197,27 @@ class IFSTranslator:
             dictionary_dir: Optional path to project folder containing dictionary/
                             (e.g. dictionary/sv-SE.json). If set, dictionary backend
                             loads from these files; if not set, uses built-in terms.
+            cache_path: SQLite file for persisting groq/google translations across runs
+                        (default: ~/.cache/ifs_translator/cache.sqlite)
+            use_persistent_cache: If False, groq/google results are neither read from nor stored in cache_path
+            refresh_cache: Send every label to the backend and overwrite its cached translation
         """
         self.backend = backend
         self.api_key = api_key or os.getenv('GROQ_API_KEY') or os.getenv('GOOGLE_API_KEY')
         self.dictionary_dir = Path(dictionary_dir) if dictionary_dir else None
         self.translation_cache = {}
+        self.persistent_cache = None
+        self.refresh_cache = refresh_cache
+        self._dict_file_cache = {}  # language -> (mtime_ns, parsed dictionary file)
+        self._http_client = None
         
         # Try to import backend-specific libraries
         if backend == 'groq':
             try:
                 from groq import Groq
-                self.groq_client = Groq(api_key=self.api_key)
+                # One keep-alive client so every batch reuses the same TCP/TLS connection
+                self._http_client = self._create_http_client()
+                self.groq_client = Groq(api_key=self.api_key, http_client=self._http_client)
                 print(f"[OK] Using Groq AI for translations (Model: llama-3.3-70b-versatile)")
             except ImportError:
                 print("[WARN] Groq library not installed. Run: pip install groq")
@@ -72,12 +242,47 @@ class IFSTranslator:
                 print("  Falling back to dictionary mode")
                 self.backend = 'dictionary'
         
+        # Network backends persist results; dictionary lookups are cheap and must track the JSON files
+        if self.backend in self.NETWORK_BACKENDS and use_persistent_cache:
+            try:
+                self.persistent_cache = PersistentTranslationCache(cache_path or DEFAULT_CACHE_PATH)
+            except (OSError, sqlite3.Error) as e:
+                print(f"[WARN] Translation cache unavailable: {e}")
+        
         if self.backend == 'dictionary':
             if self.dictionary_dir:
                 print(f"[OK] Using project dictionary from {self.dictionary_dir / 'dictionary'}")
             else:
                 print(f"[OK] Using built-in dictionary for translations")
         
+    @staticmethod
+    def _create_http_client():
+        """Create the shared HTTP client for the Groq SDK (HTTP/2 when the h2 package is installed)"""
+        import httpx
+        try:
+            return httpx.Client(http2=True, timeout=30)
+        except ImportError:
+            return httpx.Client(timeout=30)
+    
+    def close(self):
+        """Flush and close the persistent translation cache and release HTTP connections"""
+        if self.persistent_cache is not None:
+            self.persistent_cache.close()
+            self.persistent_cache = None
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+        # googletrans keeps its own pooled httpx client
+        google_client = getattr(getattr(self, 'google_translator', None), 'client', None)
+        if google_client is not None and hasattr(google_client, 'close'):
+            google_client.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+        
     def translate_batch(self, texts: List[str], target_language: str) -> Dict[str, str]:
         """
         Translate a batch of texts to target language
@@ -91,18 +296,34 @@ class IFSTranslator:
         """
         translations = {}
         
+        # Translate each distinct label once, keyed by its stripped form
+        norm_map = {text: text.strip() for text in texts}
+        unique = list(dict.fromkeys(norm_map.values()))
+        
         # Check cache first
         cache_key = target_language
         if cache_key not in self.translation_cache:
-            self.translation_cache[cache_key] = {}
+            self.translation_cache[cache_key] = OrderedDict()
+        cache = self.translation_cache[cache_key]
         
         texts_to_translate = []
-        for text in texts:
-            if text in self.translation_cache[cache_key]:
-                translations[text] = self.translation_cache[cache_key][text]
+        for text in unique:
+            if text in cache:
+                cache.move_to_end(text)
+                translations[text] = cache[text]
             else:
                 texts_to_translate.append(text)
         
+        # Network backends: codes and acronyms are never sent, they map to themselves
+        if texts_to_translate and self.backend in self.NETWORK_BACKENDS:
+            remaining = []
+            for text in texts_to_translate:
+                if _PASSTHROUGH_RE.fullmatch(text):
+                    cache[text] = translations[text] = text
+                else:
+                    remaining.append(text)
+            texts_to_translate = remaining
+        
         # Translate remaining texts
         if texts_to_translate:
             if self.backend == 'groq':
@@ -114,10 +335,50 @@ class IFSTranslator:
             
             # Update cache and results
             for original, translated in new_translations.items():
-                self.translation_cache[cache_key][original] = translated
+                cache[original] = translated
                 translations[original] = translated
         
-        return translations
+        while len(cache) > self.CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+        
+        return {original: translations.get(norm, original) for original, norm in norm_map.items()}
+    
+    def translate_batch_multilang(self, texts: List[str], target_languages: List[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Translate a batch of texts to several languages, concurrently for network backends
+        
+        Args:
+            texts: List of English texts to translate
+            target_languages: Target language codes (e.g., ['sv-SE', 'nb-NO'])
+            
+        Returns:
+            Dictionary mapping each language to its translate_batch result
+        """
+        results = {}
+        
+        # Languages fully served by the in-memory cache do not need a worker
+        pending = []
+        for language in dict.fromkeys(target_languages):
+            cache = self.translation_cache.get(language)
+            if cache is not None and all(text.strip() in cache for text in texts):
+                results[language] = self.translate_batch(texts, language)
+            else:
+                pending.append(language)
+        
+        if self.backend in self.NETWORK_BACKENDS and len(pending) > 1:
+            # Backend clients block on I/O, so one thread per language overlaps the round trips
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                futures = {
+                    language: executor.submit(self.translate_batch, texts, language)
+                    for language in pending
+                }
+                for language, future in futures.items():
+                    results[language] = future.result()
+        else:
+            for language in pending:
+                results[language] = self.translate_batch(texts, language)
+        
+        return {language: results[language] for language in target_languages}
     
     def translate_single(self, text: str, target_language: str) -> str:
         """
@@ -130,13 +391,50 @@ class IFSTranslator:
         Returns:
             Translated text
         """
+        # Fast path: memoized label, without the list/dict round trip through translate_batch
+        cache = self.translation_cache.get(target_language)
+        if cache is not None:
+            norm = text.strip()
+            if norm in cache:
+                cache.move_to_end(norm)
+                return cache[norm]
+        
         result = self.translate_batch([text], target_language)
         return result.get(text, text)
     
+    @staticmethod
+    def _chunks(texts: List[str], size: int):
+        """Yield consecutive slices of at most size texts"""
+        for i in range(0, len(texts), size):
+            yield texts[i:i + size]
+    
     def _translate_with_groq(self, texts: List[str], target_language: str) -> Dict[str, str]:
         """
         Translate using Groq AI (free, fast)
         """
+        translations = {}
+        
+        # Large batches are split so the JSON reply stays within max_tokens
+        for chunk in self._chunks(texts, self.GROQ_BATCH_SIZE):
+            try:
+                translations.update(self._request_groq(chunk, target_language))
+            except Exception as e:
+                print(f"[WARN] Groq translation failed: {e}")
+                print("  Falling back to dictionary")
+                translations.update(self._translate_with_dictionary(chunk, target_language))
+        
+        # Validate that all texts were translated
+        for text in texts:
+            if text not in translations:
+                translations[text] = text  # Fallback to original
+        
+        return translations
+    
+    @_persistent_cached
+    def _request_groq(self, texts: List[str], target_language: str) -> Dict[str, str]:
+        """
+        Send one Groq request; returns only the labels the model translated
+        """
         language_name = self.LANGUAGE_NAMES.get(target_language, target_language)
         
         # Create translation prompt
@@ -162,136 +460,91 @@ Important rules:
 4. Maintain consistency across similar terms
 5. Return ONLY the JSON object, no additional text"""
 
-        try:
-            chat_completion = self.groq_client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional translator specializing in ERP and business software terminology. You always return valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model="llama-3.3-70b-versatile",
-                temperature=0.3,  # Low temperature for consistency
-                max_tokens=2000
-            )
-            
-            response_text = chat_completion.choices[0].message.content.strip()
-            
-            # Try to extract JSON from response
-            # Sometimes the model adds markdown code blocks
-            if '```json' in response_text:
-                response_text = response_text.split('```json')[1].split('```')[0].strip()
-            elif '```' in response_text:
-                response_text = response_text.split('```')[1].split('```')[0].strip()
-            
-            translations = json.loads(response_text)
-            
-            # Validate that all texts were translated
-            for text in texts:
-                if text not in translations:
-                    translations[text] = text  # Fallback to original
-            
-            return translations
-            
-        except Exception as e:
-            print(f"[WARN] Groq translation failed: {e}")
-            print("  Falling back to dictionary")
-            return self._translate_with_dictionary(texts, target_language)
+        chat_completion = self.groq_client.chat.completions.create(
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a professional translator specializing in ERP and business software terminology. You always return valid JSON."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            model="llama-3.3-70b-versatile",
+            temperature=0.3,  # Low temperature for consistency
+            max_tokens=2000
+        )
+        
+        response_text = chat_completion.choices[0].message.content.strip()
+        
+        # Try to extract JSON from response
+        # Clean JSON is the common case; otherwise the model added markdown code blocks
+        if response_text.startswith('{'):
+            pass
+        elif '```json' in response_text:
+            response_text = response_text.split('```json', 1)[1].split('```', 1)[0].strip()
+        elif '```' in response_text:
+            response_text = response_text.split('```', 2)[1].split('```', 1)[0].strip()
+        
+        translations = _json_loads(response_text)
+        
+        # Only keep string translations of labels that were asked for, so stray keys and
+        # null/non-string values never reach the cache; missing labels fall back to the original
+        return {text: value for text in texts if isinstance(value := translations.get(text), str)}
     
     def _translate_with_google(self, texts: List[str], target_language: str) -> Dict[str, str]:
         """
         Translate using Google Translate (free tier)
         """
+        translations = {}
+        
+        # Chunked to keep each request within URL length limits
+        for chunk in self._chunks(texts, self.GOOGLE_BATCH_SIZE):
+            try:
+                translations.update(self._request_google(chunk, target_language))
+            except Exception as e:
+                print(f"[WARN] Google Translate failed: {e}")
+                print("  Falling back to dictionary")
+                translations.update(self._translate_with_dictionary(chunk, target_language))
+        
+        return translations
+    
+    @_persistent_cached
+    def _request_google(self, texts: List[str], target_language: str) -> Dict[str, str]:
+        """
+        Translate a list of texts with one Google Translate call
+        """
         # Get language code (e.g., 'sv' from 'sv-SE')
         lang_code = target_language.split('-')[0]
         
-        translations = {}
-        
-        try:
-            for text in texts:
-                result = self.google_translator.translate(text, dest=lang_code, src='en')
-                translations[text] = result.text
-            
-            return translations
-            
-        except Exception as e:
-            print(f"[WARN] Google Translate failed: {e}")
-            print("  Falling back to dictionary")
-            return self._translate_with_dictionary(texts, target_language)
+        results = self.google_translator.translate(texts, dest=lang_code, src='en')
+        return {text: result.text for text, result in zip(texts, results)}
     
     def _load_dictionary_file(self, target_language: str) -> Dict[str, str]:
         """Load dictionary for a language from project folder. Returns {} if missing or invalid."""
         if not self.dictionary_dir:
             return {}
         path = self.dictionary_dir / "dictionary" / f"{target_language}.json"
-        if not path.exists():
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
             return {}
+        # Reuse the parsed file until it is modified on disk
+        cached = self._dict_file_cache.get(target_language)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
         try:
-            with open(path, encoding="utf-8") as f:
-                data = json.load(f)
-            return data if isinstance(data, dict) else {}
-        except (json.JSONDecodeError, OSError):
+            data = _json_loads(path.read_bytes())
+        except (ValueError, OSError):
             return {}
+        data = data if isinstance(data, dict) else {}
+        self._dict_file_cache[target_language] = (mtime, data)
+        return data
 
-    def _get_builtin_terms(self, target_language: str) -> Dict[str, str]:
+    def _get_builtin_terms(self, target_language: str) -> Mapping[str, str]:
         """Return built-in terms for backward compatibility when no dictionary_dir is set."""
-        swedish_terms = {
-            'Branch No': 'Filialnummer',
-            'EAN': 'EAN',
-            'Technical Description': 'Teknisk beskrivning',
-            'Sales UOM': 'Försäljnings-enhet',
-            'Package Measurement': 'Paketmått',
-            'Min Order Qty': 'Min orderkvantitet',
-            'List Price': 'Listpris',
-            'Discount (%)': 'Rabatt (%)',
-            'Stored Article': 'Lagrad artikel',
-            'Product URL': 'Produkt-URL',
-            'Account Reference': 'Kontoreferens',
-            'Security Sheet': 'Säkerhetsdatablad',
-            'Environmental Classification': 'Miljöklassificering',
-            'Cross Reference': 'Korsreferens',
-            "Supplier's Product Category 2": 'Leverantörens produktkategori 2',
-            'Statistic Group': 'Statistikgrupp',
-            'Part Synonym': 'Artikelsynonym',
-            'Environmental Details': 'Miljödetaljer',
-            'C Actual Cost': 'Verklig kostnad',
-            'C Actual Revenue': 'Verklig intäkt',
-            'Actual Cost': 'Verklig kostnad',
-            'Actual Revenue': 'Verklig intäkt'
-        }
-        norwegian_terms = {
-            'Branch No': 'Filialnummer',
-            'EAN': 'EAN',
-            'Technical Description': 'Teknisk beskrivelse',
-            'Sales UOM': 'Salgsenhet',
-            'Package Measurement': 'Pakkemål',
-            'Min Order Qty': 'Min bestillingsmengde',
-            'List Price': 'Listepris',
-            'Discount (%)': 'Rabatt (%)',
-            'Stored Article': 'Lagret artikkel',
-            'Product URL': 'Produkt-URL',
-            'Account Reference': 'Kontoreferanse',
-            'Security Sheet': 'Sikkerhetsdatablad',
-            'Environmental Classification': 'Miljøklassifisering',
-            'Cross Reference': 'Kryssreferanse',
-            "Supplier's Product Category 2": 'Leverandørens produktkategori 2',
-            'Statistic Group': 'Statistikkgruppe',
-            'Part Synonym': 'Artikkelsynonym',
-            'Environmental Details': 'Miljødetaljer',
-            'C Actual Cost': 'Faktisk kostnad',
-            'C Actual Revenue': 'Faktisk inntekt',
-            'Actual Cost': 'Faktisk kostnad',
-            'Actual Revenue': 'Faktisk inntekt'
-        }
-        if target_language == 'sv-SE':
-            return swedish_terms
-        if target_language == 'nb-NO':
-            return norwegian_terms
-        return {}
+        return _BUILTIN_TERMS.get(target_language, _NO_TERMS)
 
     def _translate_with_dictionary(self, texts: List[str], target_language: str) -> Dict[str, str]:
         """
@@ -304,10 +557,7 @@ Important rules:
                 term_dict = self._get_builtin_terms(target_language)
         else:
             term_dict = self._get_builtin_terms(target_language)
-        translations = {}
-        for text in texts:
-            translations[text] = term_dict.get(text, text)
-        return translations
+        return {text: term_dict.get(text, text) for text in texts}
     
     def get_supported_languages(self) -> List[str]:
         """Get list of supported language codes"""
@@ -3,12 +3,20 @@ IFS .trs Translation File Generator
 Generates translation files with P: and A:Prompt entries
 """
 
-from typing import Dict, Any, List
+import functools
+from typing import Dict, Any, Callable, Iterator, List, Tuple, Union
 from pathlib import Path
 
 
 class TRSGenerator:
-    """Generator for IFS .trs translation files"""
+    """
+    Generator for IFS .trs translation files
+    
+    Translate every label in one batch before generating:
+        labels = TRSGenerator.collect_labels(data)
+        translations = translator.translate_batch(labels, language)
+        generator.generate_file(data, translations, output_path)
+    """
     
     # Language mappings
     LANGUAGES = {
@@ -16,6 +24,29 @@ class TRSGenerator:
         'nb-NO': {'code': 'no', 'name': 'Norwegian'}
     }
     
+    # Pre-encoded tab prefixes by nesting depth (LU -> View -> Column)
+    _INDENTS = (b'', b'\t', b'\t\t', b'\t\t\t', b'\t\t\t\t')
+    
+    # Precompiled LU/View line templates: (indent, value); .trs CS lines carry no flags
+    _CS = b'%sCS:%s^LU\r\n'
+    _CE = b'%sCE:\r\n'
+    
+    # Fixed header layout: (module, language code, culture, layer, main type, sub type)
+    _HEADER_TEMPLATE = (
+        "-------------------------------------------------------\r\n"
+        "File Type: IFS Foundation Translation File\r\n"
+        "Type version: 10.00\r\n"
+        "-------------------------------------------------------\r\n"
+        "Module: %s\r\n"
+        "Language: %s\r\n"
+        "Culture: %s\r\n"
+        "Layer: %s\r\n"
+        "Main Type: %s\r\n"
+        "Sub Type: %s\r\n"
+        "Content: \r\n"
+        "-------------------------------------------------------\r\n"
+    )
+    
     def __init__(self, module: str, layer: str, language: str, main_type: str = "LU", sub_type: str = "Logical Unit"):
         self.module = module
         self.layer = layer
@@ -34,21 +65,26 @@ class TRSGenerator:
     
     def generate_header(self) -> str:
         """Generate .trs file header"""
-        header = [
-            "-------------------------------------------------------",
-            "File Type: IFS Foundation Translation File",
-            "Type version: 10.00",
-            "-------------------------------------------------------",
-            f"Module: {self.module}",
-            f"Language: {self.lang_code}",
-            f"Culture: {self.culture}",
-            f"Layer: {self.layer}",
-            f"Main Type: {self.main_type}",
-            f"Sub Type: {self.sub_type}",
-            "Content: ",
-            "-------------------------------------------------------"
-        ]
-        return '\r\n'.join(header) + '\r\n'
+        return self._HEADER_TEMPLATE % (self.module, self.lang_code, self.culture,
+                                        self.layer, self.main_type, self.sub_type)
+    
+    @staticmethod
+    def collect_labels(data: Dict[str, Any]) -> List[str]:
+        """
+        Collect the distinct custom column labels of the whole tree, in first-seen order
+        
+        Args:
+            data: Parsed and filtered data structure
+            
+        Returns:
+            List of labels to pass to a single translate_batch call
+        """
+        return list(dict.fromkeys(
+            label
+            for lu_data in data['logical_units'].values()
+            for view_data in lu_data['views'].values()
+            for label in view_data['col_labels']
+        ))
     
     def generate_content(self, data: Dict[str, Any], translations: Dict[str, str]) -> str:
         """
@@ -61,100 +97,94 @@ class TRSGenerator:
         Returns:
             Complete .trs file content as string
         """
-        lines = []
-        
-        # Process each logical unit
-        for lu_id, lu_data in data['logical_units'].items():
-            lu_lines = self._generate_lu_block(lu_data, translations, indent_level=0)
-            lines.extend(lu_lines)
+        return b''.join(self.iter_content(data, translations)).decode('utf-8')
+    
+    def iter_content(self, data: Dict[str, Any], translations: Dict[str, str]) -> Iterator[bytes]:
+        """
+        Yield UTF-8 encoded .trs file content one Logical Unit block at a time
         
-        return ''.join(lines)
+        Args:
+            data: Parsed and filtered data structure
+            translations: Dictionary mapping English labels to translated labels
+            
+        Yields:
+            Content chunk for each logical unit
+        """
+        # One output list reused across LUs; emitters get its bound append
+        lines: List[bytes] = []
+        append = lines.append
+        for lu_data in data['logical_units'].values():
+            self._generate_lu_block(lu_data, translations, 0, append)
+            yield b''.join(lines)
+            lines.clear()
     
-    def _generate_lu_block(self, lu_data: Dict[str, Any], translations: Dict[str, str], indent_level: int) -> List[str]:
+    def _generate_lu_block(self, lu_data: Dict[str, Any], translations: Dict[str, str], indent_level: int,
+                           append: Callable[[bytes], None]):
         """Generate CS/CE block for a Logical Unit"""
-        lines = []
-        indent = '\t' * indent_level
+        indent = self._INDENTS[indent_level]
         
-        # CS line for LU (no flags in .trs)
-        lu_name = lu_data['name']
-        lines.append(f"{indent}CS:{lu_name}^LU\r\n")
+        # CS line for LU
+        append(self._CS % (indent, lu_data['name'].encode('utf-8')))
         
         # Process views
-        for view_id, view_data in lu_data['views'].items():
-            view_lines = self._generate_view_block(view_data, translations, indent_level + 1)
-            lines.extend(view_lines)
+        for view_data in lu_data['views'].values():
+            self._generate_view_block(view_data, translations, indent_level + 1, append)
         
         # CE line for LU
-        lines.append(f"{indent}CE:\r\n")
-        
-        return lines
+        append(self._CE % indent)
     
-    def _generate_view_block(self, view_data: Dict[str, Any], translations: Dict[str, str], indent_level: int) -> List[str]:
+    def _generate_view_block(self, view_data: Dict[str, Any], translations: Dict[str, str], indent_level: int,
+                             append: Callable[[bytes], None]):
         """Generate CS/CE block for a View"""
-        lines = []
-        indent = '\t' * indent_level
-        
-        # CS line for View (no flags in .trs)
-        view_control = view_data['control']
-        lines.append(f"{indent}CS:{view_control}^LU\r\n")
-        
-        # Process columns (only custom fields)
-        for col_id, col_data in view_data['columns'].items():
-            if col_data['is_custom']:
-                col_lines = self._generate_column_block(col_data, translations, indent_level + 1)
-                lines.extend(col_lines)
+        indent = self._INDENTS[indent_level]
+        
+        # CS line for View
+        append(self._CS % (indent, view_data['control'].encode('utf-8')))
+        
+        # Process columns (only custom fields are stored), one join of fixed and encoded pieces per column
+        cs, p, a_prompt, ce = self._column_fragments(indent_level + 1)
+        get_translation = translations.get
+        join = b''.join
+        for col_control, col_label in zip(view_data['col_controls'], view_data['col_labels']):
+            translated = get_translation(col_label, col_label)
+            # Missing or non-string translations (e.g. None) keep the English label
+            if not isinstance(translated, str):
+                translated = col_label
+            append(join((cs, col_control.encode('utf-8'), p, col_label.encode('utf-8'),
+                         a_prompt, translated.encode('utf-8'), ce)))
         
         # CE line for View
-        lines.append(f"{indent}CE:\r\n")
-        
-        return lines
+        append(self._CE % indent)
     
-    def _generate_column_block(self, col_data: Dict[str, Any], translations: Dict[str, str], indent_level: int) -> List[str]:
-        """Generate CS/CE block for a Column"""
-        lines = []
-        indent = '\t' * indent_level
-        
-        # CS line for Column (no flags in .trs)
-        col_control = col_data['control']
-        lines.append(f"{indent}CS:{col_control}^LU\r\n")
-        
-        # P: line for original English text
-        original_label = col_data['label']
-        lines.append(f"{indent}\tP:{original_label}^\r\n")
-        
-        # A:Prompt for translated text
-        translated_label = translations.get(original_label, original_label)
-        lines.append(f"{indent}\tA:Prompt^{translated_label}^\r\n")
-        
-        # CE line for Column
-        lines.append(f"{indent}CE:\r\n")
-        
-        return lines
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _column_fragments(indent_level: int) -> Tuple[bytes, bytes, bytes, bytes]:
+        """Fixed pieces around (control, label, translation) of a column block, with the indent baked in"""
+        indent = b'\t' * indent_level
+        return (indent + b'CS:',
+                b'^LU\r\n' + indent + b'\tP:',
+                b'^\r\n' + indent + b'\tA:Prompt^',
+                b'^\r\n' + indent + b'CE:\r\n')
     
-    def generate_file(self, data: Dict[str, Any], translations: Dict[str, str], output_path: str) -> str:
+    def generate_file(self, data: Dict[str, Any], translations: Dict[str, str], output_path: Union[str, Path]) -> str:
         """
         Generate complete .trs file
         
         Args:
             data: Parsed and filtered data structure
             translations: Dictionary mapping English labels to translated labels
-            output_path: Path to write the file
+            output_path: Path to write the file (its directory must already exist)
             
         Returns:
             Path to generated file
         """
-        header = self.generate_header()
-        content = self.generate_content(data, translations)
-        
-        full_content = header + content
-        
-        output_file = Path(output_path)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_file, 'w', encoding='utf-8', newline='') as f:
-            f.write(full_content)
+        # Stream pre-encoded LU blocks to disk so the whole file is never held in memory at once
+        with open(output_path, 'wb', buffering=1 << 16) as f:
+            f.write(self.generate_header().encode('utf-8'))
+            for chunk in self.iter_content(data, translations):
+                f.write(chunk)
         
-        return str(output_file)
+        return str(output_path)
     
     def get_file_name(self, module: str, layer: str, language: str) -> str:
         """
@@ -193,13 +223,9 @@ if __name__ == '__main__':
                     'TEST_VIEW': {
                         'control': 'TEST_VIEW',
                         'label': 'Test View',
-                        'columns': {
-                            'C_TEST_FIELD': {
-                                'control': 'C_TEST_FIELD',
-                                'label': 'Test Field',
-                                'is_custom': True
-                            }
-                        }
+                        'col_ids': ['TestLU.TEST_VIEW.C_TEST_FIELD'],
+                        'col_controls': ['C_TEST_FIELD'],
+                        'col_labels': ['Test Field']
                     }
                 }
             }
@@ -3,28 +3,107 @@ IFS File Validator
 Validates .lng and .trs files for correctness
 """
 
-from typing import List, Tuple, Optional
+from collections import OrderedDict
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 from pathlib import Path
+import os
 import re
 
 
+# Header markers, all found in one scan of the raw header bytes
+_LNG_FILE_TYPE = "IFS Foundation Language File"
+_TRS_FILE_TYPE = "IFS Foundation Translation File"
+_TYPE_VERSION = "Type version: 10.00"
+_REQUIRED_HEADER_FIELDS = ('Module:', 'Layer:', 'Main Type:', 'Sub Type:')
+_HEADER_MARKERS_RE = re.compile(b'|'.join(
+    re.escape(marker.encode('ascii'))
+    for marker in (_LNG_FILE_TYPE, _TRS_FILE_TYPE, _TYPE_VERSION) + _REQUIRED_HEADER_FIELDS
+))
+
+# Lines are scanned as bytes; indexing bytes yields ints
+_CARET = ord('^')
+
+# Content line kinds, dispatched on the first three bytes of the stripped line.
+# P: lines have no fixed third byte, so they are matched when no key hits.
+_CS_LINE, _CE_LINE, _PROMPT_LINE = 1, 2, 3
+_LINE_KINDS = {b'CS:': _CS_LINE, b'CE:': _CE_LINE, b'A:P': _PROMPT_LINE}
+
+# Per file type content rules, keyed by is_lng: (CS caret count, check P: lines, CS format error)
+# .lng: CS:identifier^type^subtype^flag1^flag2, .trs: CS:identifier^type (no flags)
+_CONTENT_RULES = {
+    True: (4, False, "Line {}: Invalid CS format. Expected 5 parts, got {}"),
+    False: (1, True, "Line {}: Invalid CS format for .trs. Expected 2 parts, got {}"),
+}
+
+
+def _utf8_checked(lines: Iterable[bytes]) -> Iterator[bytes]:
+    """Pass raw lines through, decoding only non-ASCII ones so invalid UTF-8 still fails the read"""
+    for line in lines:
+        if not line.isascii():
+            line.decode('utf-8')
+        yield line
+
+
+# Results of validators created with cache_results=True, keyed by (path, size, mtime_ns, fast_fail).
+# A rewrite with the same size within one mtime tick is not detected, so it is opt-in.
+_RESULT_CACHE: "OrderedDict[tuple, Tuple[bool, Tuple[str, ...], Tuple[str, ...]]]" = OrderedDict()
+
+
 class IFSValidator:
     """Validator for IFS .lng and .trs files"""
     
-    def __init__(self):
+    # Upper bound on memoized validate_file results (least recently used are dropped)
+    RESULT_CACHE_MAX_ENTRIES = 1024
+    
+    def __init__(self, cache_results: bool = False):
+        """
+        Args:
+            cache_results: Reuse the result for a file whose path, size and mtime are
+                           unchanged (for repeated checks of the same outputs, e.g. tests)
+        """
+        self.cache_results = cache_results
         self.errors = []
         self.warnings = []
         
-    def validate_file(self, file_path: str) -> Tuple[bool, List[str], List[str]]:
+    def validate_file(self, file_path: str, fast_fail: bool = False) -> Tuple[bool, List[str], List[str]]:
         """
         Validate a .lng or .trs file
         
         Args:
             file_path: Path to file to validate
+            fast_fail: Stop at the first failing check instead of collecting every error
             
         Returns:
             Tuple of (is_valid, errors, warnings)
         """
+        if not self.cache_results:
+            return self._validate_file_uncached(file_path, fast_fail)
+        
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            # Missing or unreadable files are reported by the uncached path
+            return self._validate_file_uncached(file_path, fast_fail)
+        
+        key = (os.fspath(file_path), st.st_size, st.st_mtime_ns, fast_fail)
+        cached = _RESULT_CACHE.get(key)
+        if cached is not None:
+            _RESULT_CACHE.move_to_end(key)
+            is_valid, errors, warnings = cached
+            self.errors = list(errors)
+            self.warnings = list(warnings)
+            return is_valid, self.errors, self.warnings
+        
+        result = self._validate_file_uncached(file_path, fast_fail)
+        # Store immutable copies; callers get fresh lists on every hit
+        _RESULT_CACHE[key] = (result[0], tuple(self.errors), tuple(self.warnings))
+        while len(_RESULT_CACHE) > self.RESULT_CACHE_MAX_ENTRIES:
+            _RESULT_CACHE.popitem(last=False)
+        return result
+    
+    def _validate_file_uncached(self, file_path: str, fast_fail: bool = False) -> Tuple[bool, List[str], List[str]]:
+        """Validate a file without consulting the result cache"""
         self.errors = []
         self.warnings = []
         
@@ -34,14 +113,6 @@ class IFSValidator:
             self.errors.append(f"File does not exist: {file_path}")
             return False, self.errors, self.warnings
         
-        # Read file content
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-        except Exception as e:
-            self.errors.append(f"Failed to read file: {e}")
-            return False, self.errors, self.warnings
-        
         # Determine file type
         is_lng = file_path.suffix == '.lng'
         is_trs = file_path.suffix == '.trs'
@@ -50,152 +121,149 @@ class IFSValidator:
             self.errors.append(f"Unknown file type: {file_path.suffix}")
             return False, self.errors, self.warnings
         
-        # Validate header
-        self._validate_header(lines, is_lng)
+        # Stream the raw file: only the header lines are kept in memory, and all
+        # markers are ASCII so lines are never decoded unless they hold non-ASCII text
+        try:
+            with open(file_path, 'rb') as f:
+                found_content = self._validate_lines(_utf8_checked(f), is_lng, fast_fail)
+        except (OSError, ValueError) as e:
+            self.errors = [f"Failed to read file: {e}"]
+            self.warnings = []
+            return False, self.errors, self.warnings
         
-        # Find content start
-        content_start = self._find_content_start(lines)
-        if content_start is None:
+        if not found_content:
             self.errors.append("Could not find content section")
             return False, self.errors, self.warnings
         
-        # Validate CS/CE pairing
-        self._validate_cs_ce_pairing(lines[content_start:], content_start)
-        
-        # Validate indentation
-        self._validate_indentation(lines[content_start:], content_start)
-        
-        # Validate structure
-        if is_lng:
-            self._validate_lng_structure(lines[content_start:], content_start)
-        else:
-            self._validate_trs_structure(lines[content_start:], content_start)
-        
         is_valid = len(self.errors) == 0
         return is_valid, self.errors, self.warnings
     
-    def _validate_header(self, lines: List[str], is_lng: bool):
-        """Validate file header"""
+    def _validate_lines(self, lines: Iterator[bytes], is_lng: bool, fast_fail: bool = False) -> bool:
+        """Validate header and content from a line iterator; False if there is no content section"""
+        # Validate header
+        header = list(islice(lines, 15))
+        self._validate_header(header, is_lng, fast_fail)
+        if fast_fail and self.errors:
+            return True
+        
+        # Find content start
+        remaining = chain(header, lines)
+        found = self._find_content_start(remaining)
+        if found is None:
+            return False
+        
+        # Validate CS/CE pairing, indentation and structure
+        content_start, first_line = found
+        self._validate_content(chain((first_line,), remaining), content_start, is_lng, fast_fail)
+        return True
+    
+    def _validate_header(self, lines: List[bytes], is_lng: bool, fast_fail: bool = False):
+        """Validate file header (only the first error is reported with fast_fail)"""
         if len(lines) < 10:
             self.errors.append("File too short, missing header")
             return
         
-        expected_type = "IFS Foundation Language File" if is_lng else "IFS Foundation Translation File"
+        expected_type = _LNG_FILE_TYPE if is_lng else _TRS_FILE_TYPE
+        
+        # Collect every marker present in a single pass - be lenient with whitespace
+        header_text = b''.join(lines[:15])
+        found = {match.group().decode('ascii') for match in _HEADER_MARKERS_RE.finditer(header_text)}
         
-        # Check file type line - be lenient with whitespace
-        header_text = ''.join(lines[:15])
-        if expected_type not in header_text:
+        # Check file type line
+        if expected_type not in found:
             self.errors.append(f"Invalid file type header. Expected: {expected_type}")
+            if fast_fail:
+                return
         
         # Check version
-        if "Type version: 10.00" not in header_text:
+        if _TYPE_VERSION not in found:
             self.warnings.append("Type version is not 10.00")
         
         # Check required fields
-        required_fields = ['Module:', 'Layer:', 'Main Type:', 'Sub Type:']
-        for field in required_fields:
-            if field not in header_text:
+        for field in _REQUIRED_HEADER_FIELDS:
+            if field not in found:
                 self.errors.append(f"Missing required header field: {field}")
+                if fast_fail:
+                    return
     
-    def _find_content_start(self, lines: List[str]) -> Optional[int]:
-        """Find the line where content starts (after header)"""
+    def _find_content_start(self, lines: Iterator[bytes]) -> Optional[Tuple[int, bytes]]:
+        """Find the line where content starts (after header); returns its index and raw line"""
         for i, line in enumerate(lines):
-            if line.strip().startswith('CS:'):
-                return i
+            if line.strip().startswith(b'CS:'):
+                return i, line
         return None
     
-    def _validate_cs_ce_pairing(self, content_lines: List[str], offset: int):
-        """Validate that every CS has a matching CE"""
-        stack = []
+    def _validate_content(self, content_lines: Iterable[bytes], content_start: int, is_lng: bool,
+                          fast_fail: bool = False):
+        """Validate CS/CE pairing, indentation and line structure in a single pass"""
+        # Open CS lines and their line numbers; identifiers are only sliced out for error messages
+        open_lines = []
+        open_line_nums = []
+        # Structure errors are reported after pairing errors
+        structure_errors = []
+        # Rules for this file type are fixed up front, so the loop never branches on it
+        cs_carets, check_p_lines, cs_format_error = _CONTENT_RULES[is_lng]
         
-        for i, line in enumerate(content_lines):
-            line_num = i + offset + 1
-            stripped = line.strip()
-            
-            if stripped.startswith('CS:'):
-                # Extract identifier
-                match = re.match(r'CS:([^^]+)', stripped)
-                if match:
-                    identifier = match.group(1)
-                    stack.append((identifier, line_num))
-                else:
-                    self.errors.append(f"Line {line_num}: Malformed CS line: {stripped}")
-            
-            elif stripped.startswith('CE:'):
-                if not stack:
-                    self.errors.append(f"Line {line_num}: CE without matching CS")
-                else:
-                    stack.pop()
+        # Bound appends for the per-line loop
+        error = self.errors.append
+        warning = self.warnings.append
+        structure_error = structure_errors.append
+        push_line, push_line_num = open_lines.append, open_line_nums.append
+        pop_line, pop_line_num = open_lines.pop, open_line_nums.pop
+        line_kind = _LINE_KINDS.get
         
-        # Check for unclosed CS blocks
-        if stack:
-            for identifier, line_num in stack:
-                self.errors.append(f"Line {line_num}: CS '{identifier}' not closed with CE")
-    
-    def _validate_indentation(self, content_lines: List[str], offset: int):
-        """Validate indentation is consistent (tabs)"""
-        for i, line in enumerate(content_lines):
-            line_num = i + offset + 1
-            
-            # Skip empty lines
-            if not line.strip():
+        for line_num, line in enumerate(content_lines, content_start + 1):
+            # Skip empty lines without allocating a stripped copy (later checks may index stripped[-1])
+            if not line or line.isspace():
                 continue
+            stripped = line.strip()
             
             # Check that indentation uses tabs, not spaces
-            if line.startswith(' ') and not line.startswith('\t'):
-                self.warnings.append(f"Line {line_num}: Uses spaces instead of tabs for indentation")
+            if line.startswith(b' '):
+                warning(f"Line {line_num}: Uses spaces instead of tabs for indentation")
             
-            # Count indentation level
-            indent_count = 0
-            for char in line:
-                if char == '\t':
-                    indent_count += 1
+            kind = line_kind(stripped[:3])
+            if kind == _CS_LINE:
+                # The identifier (everything up to the first ^) must not be empty
+                if len(stripped) == 3 or stripped.find(b'^', 3) == 3:
+                    error(f"Line {line_num}: Malformed CS line: {stripped.decode('utf-8')}")
                 else:
-                    break
-    
-    def _validate_lng_structure(self, content_lines: List[str], offset: int):
-        """Validate .lng file structure"""
-        for i, line in enumerate(content_lines):
-            line_num = i + offset + 1
-            stripped = line.strip()
+                    push_line(stripped)
+                    push_line_num(line_num)
+                
+                carets = stripped.count(b'^')
+                if carets != cs_carets:
+                    structure_error(cs_format_error.format(line_num, carets + 1))
             
-            # Validate CS line format
-            if stripped.startswith('CS:'):
-                # Should have format: CS:identifier^type^subtype^flag1^flag2
-                parts = stripped.split('^')
-                if len(parts) != 5:
-                    self.errors.append(f"Line {line_num}: Invalid CS format. Expected 5 parts, got {len(parts)}")
+            elif kind == _CE_LINE:
+                if not open_lines:
+                    error(f"Line {line_num}: CE without matching CS")
+                else:
+                    pop_line()
+                    pop_line_num()
             
             # Validate A:Prompt format
-            if stripped.startswith('A:Prompt^'):
-                # Should end with ^
-                if not stripped.endswith('^'):
-                    self.errors.append(f"Line {line_num}: A:Prompt should end with ^")
-    
-    def _validate_trs_structure(self, content_lines: List[str], offset: int):
-        """Validate .trs file structure"""
-        for i, line in enumerate(content_lines):
-            line_num = i + offset + 1
-            stripped = line.strip()
+            elif kind == _PROMPT_LINE:
+                if stripped.startswith(b'A:Prompt^') and stripped[-1] != _CARET:
+                    structure_error(f"Line {line_num}: A:Prompt should end with ^")
             
-            # Validate CS line format (no flags in .trs)
-            if stripped.startswith('CS:'):
-                # Should have format: CS:identifier^type
-                parts = stripped.split('^')
-                if len(parts) != 2:
-                    self.errors.append(f"Line {line_num}: Invalid CS format for .trs. Expected 2 parts, got {len(parts)}")
+            # Validate P: format (.trs only)
+            elif stripped.startswith(b'P:'):
+                if check_p_lines and stripped[-1] != _CARET:
+                    structure_error(f"Line {line_num}: P: line should end with ^")
             
-            # Validate P: format
-            if stripped.startswith('P:'):
-                # Should end with ^
-                if not stripped.endswith('^'):
-                    self.errors.append(f"Line {line_num}: P: line should end with ^")
-            
-            # Validate A:Prompt format
-            if stripped.startswith('A:Prompt^'):
-                # Should end with ^
-                if not stripped.endswith('^'):
-                    self.errors.append(f"Line {line_num}: A:Prompt should end with ^")
+            # Stop at the first error; the CS stack is incomplete, so skip the unclosed check
+            if fast_fail and (self.errors or structure_errors):
+                self.errors.extend(structure_errors)
+                return
+        
+        # Check for unclosed CS blocks
+        for cs_line, line_num in zip(open_lines, open_line_nums):
+            caret = cs_line.find(b'^', 3)
+            identifier = cs_line[3:] if caret == -1 else cs_line[3:caret]
+            self.errors.append(f"Line {line_num}: CS '{identifier.decode('utf-8')}' not closed with CE")
+        
+        self.errors.extend(structure_errors)
     
     def validate_hierarchy(self, file_path: str) -> bool:
         """
@@ -214,14 +282,34 @@ class IFSValidator:
     def get_summary(self) -> str:
         """Get validation summary"""
         return f"Validation: {len(self.errors)} errors, {len(self.warnings)} warnings"
+    
+    @classmethod
+    def check(cls, file_path: str, fast_fail: bool = False) -> Tuple[bool, List[str], List[str]]:
+        """
+        Validate a file with a shared instance of this class, created on first use (not thread-safe)
+        
+        Args:
+            file_path: Path to file to validate
+            fast_fail: Stop at the first failing check instead of collecting every error
+            
+        Returns:
+            Tuple of (is_valid, errors, warnings)
+        """
+        validator = _DEFAULT_VALIDATORS.get(cls)
+        if validator is None:
+            validator = _DEFAULT_VALIDATORS[cls] = cls()
+        return validator.validate_file(file_path, fast_fail)
+
+
+# Shared instances for check, one per (sub)class; validate_file resets their state on every call
+_DEFAULT_VALIDATORS: Dict[type, IFSValidator] = {}
 
 
 if __name__ == '__main__':
     # Test the validator
     import sys
     if len(sys.argv) > 1:
-        validator = IFSValidator()
-        is_valid, errors, warnings = validator.validate_file(sys.argv[1])
+        is_valid, errors, warnings = IFSValidator.check(sys.argv[1])
         
         print(f"Valid: {is_valid}")
         if errors:
@@ -3,9 +3,13 @@ Pytest configuration and shared fixtures for IFS Translator tests.
 Adds src to sys.path so modules can be imported.
 """
 
+import os
 import sys
+import types
 from pathlib import Path
 
+import pytest
+
 # Project root (parent of tests/)
 REPO_ROOT = Path(__file__).resolve().parent.parent
 SRC_DIR = REPO_ROOT / "src"
@@ -23,3 +27,92 @@ def pytest_configure(config):
 # Shared paths
 TEST_DIR = REPO_ROOT / "test"
 TEST_OUT_DIR = TEST_DIR / "out"
+
+
+@pytest.fixture(scope="session")
+def test_out_dir():
+    """Output directory for generated files; created once per test session (one per pytest-xdist worker)."""
+    out_dir = TEST_OUT_DIR / os.environ.get("PYTEST_XDIST_WORKER", "")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    yield out_dir
+    # Optional: leave files for inspection; .gitignore excludes test/out/
+
+
+@pytest.fixture(scope="session")
+def run_automation(test_out_dir):
+    """
+    Run the tool at most once per (XML, languages, backend) per session.
+    Returns a function that runs (or reuses) a run and returns its output directory,
+    a subdirectory of test_out_dir named after the XML so runs never share files.
+    """
+    from main import IFSLanguageAutomation
+
+    completed = set()
+
+    def run(xml_path, languages=("sv-SE", "nb-NO"), backend="dictionary"):
+        key = (Path(xml_path).resolve(), tuple(languages), backend)
+        out_dir = test_out_dir / Path(xml_path).stem
+        if key not in completed:
+            automation = IFSLanguageAutomation(
+                xml_path=str(xml_path),
+                output_dir=str(out_dir),
+                languages=list(languages),
+                translation_backend=backend,
+            )
+            automation.run()
+            completed.add(key)
+        return out_dir
+
+    return run
+
+
+class StubGoogleTranslator:
+    """googletrans.Translator stand-in: records every request and returns '<lang>:<text>'."""
+
+    def __init__(self):
+        self.requests = []
+        self.fail = False
+
+    def translate(self, texts, dest, src):
+        if self.fail:
+            raise RuntimeError("backend unavailable")
+        self.requests.append(list(texts))
+        return [types.SimpleNamespace(text=f"{dest}:{text}") for text in texts]
+
+
+@pytest.fixture
+def stub_google(monkeypatch):
+    """
+    Install a fake googletrans module so IFSTranslator(backend="google") runs offline.
+    Returns the StubGoogleTranslator the translator will use.
+    """
+    stub = StubGoogleTranslator()
+    monkeypatch.setitem(sys.modules, "googletrans", types.SimpleNamespace(Translator=lambda: stub))
+    return stub
+
+
+class StubGroqClient:
+    """groq.Groq stand-in: records every prompt and returns the JSON text in self.reply."""
+
+    def __init__(self):
+        self.requests = []
+        self.reply = "{}"
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self._create))
+
+    def _create(self, messages, **kwargs):
+        self.requests.append(messages[-1]["content"])
+        message = types.SimpleNamespace(content=self.reply)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def stub_groq(monkeypatch):
+    """
+    Install fake groq and httpx modules so IFSTranslator(backend="groq") runs offline.
+    Returns the StubGroqClient the translator will use; set its reply before translating.
+    """
+    stub = StubGroqClient()
+    http_client = types.SimpleNamespace(close=lambda: None)
+    monkeypatch.setitem(sys.modules, "httpx", types.SimpleNamespace(Client=lambda **kwargs: http_client))
+    monkeypatch.setitem(sys.modules, "groq", types.SimpleNamespace(Groq=lambda **kwargs: stub))
+    return stub
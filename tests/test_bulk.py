@@ -2,60 +2,56 @@
 Bulk tests: run tool on all test XMLs, validate outputs, and compare to expected files.
 """
 
+import os
 import sys
 from pathlib import Path
 
 import pytest
 
 # conftest adds src to path
-from main import IFSLanguageAutomation
 from validator import IFSValidator
 
-from .conftest import REPO_ROOT, TEST_DIR, TEST_OUT_DIR
+from .conftest import REPO_ROOT, TEST_DIR
 
 
 def _normalize_content(content: str) -> str:
-    """Normalize line endings and trailing newlines for comparison."""
-    return content.replace("\r\n", "\n").replace("\r", "\n").rstrip("\n") + "\n"
+    """Normalize trailing newlines for comparison; _read_normalized already unified line endings."""
+    return content.rstrip("\n") + "\n"
 
 
 def _read_normalized(path: Path) -> str:
-    with open(path, "r", encoding="utf-8") as f:
+    # Universal newlines mode turns \r\n and \r into \n while decoding, in one pass
+    with open(path, "r", encoding="utf-8", newline=None) as f:
         return _normalize_content(f.read())
 
 
-@pytest.fixture(scope="module")
-def test_out_dir():
-    """Output directory for generated files; created once per test module run."""
-    TEST_OUT_DIR.mkdir(parents=True, exist_ok=True)
-    yield TEST_OUT_DIR
-    # Optional: leave files for inspection; .gitignore excludes test/out/
+def _scan_files(directory: Path, prefix: str = "", suffixes=("",)) -> list:
+    """Sorted paths of regular files in directory (non-recursive) matching prefix and any suffix."""
+    with os.scandir(directory) as entries:
+        names = [
+            entry.name for entry in entries
+            if entry.name.startswith(prefix) and entry.name.endswith(suffixes) and entry.is_file()
+        ]
+    return sorted(directory / name for name in names)
 
 
 def discover_xml_fixtures():
     """Paths to all translationDb_*.xml in test/."""
     if not TEST_DIR.exists():
         return []
-    return sorted(TEST_DIR.glob("translationDb_*.xml"))
+    return _scan_files(TEST_DIR, "translationDb_", (".xml",))
 
 
 @pytest.mark.parametrize("xml_path", discover_xml_fixtures(), ids=lambda p: p.name)
-def test_bulk_run_and_validate(xml_path, test_out_dir):
+def test_bulk_run_and_validate(xml_path, run_automation):
     """Run automation on each test XML and validate all generated .lng and .trs files."""
-    automation = IFSLanguageAutomation(
-        xml_path=str(xml_path),
-        output_dir=str(test_out_dir),
-        languages=["sv-SE", "nb-NO"],
-        translation_backend="dictionary",
-    )
-    automation.run()
-
-    # Validate every generated .lng and .trs in output dir
-    validator = IFSValidator()
-    for ext in (".lng", ".trs"):
-        for path in test_out_dir.glob(f"*{ext}"):
-            is_valid, errors, _ = validator.validate_file(str(path))
-            assert is_valid, f"{path.name}: {errors}"
+    out_dir = run_automation(xml_path, languages=["sv-SE", "nb-NO"], backend="dictionary")
+
+    # Validate every .lng and .trs generated for this XML
+    validator = IFSValidator(cache_results=True)
+    for path in _scan_files(out_dir, suffixes=(".lng", ".trs")):
+        is_valid, errors, _ = validator.validate_file(str(path), fast_fail=True)
+        assert is_valid, f"{path.name}: {errors}"
 
 
 # Expected output files for ActivityEstimate (PROJ/Cust) – only case with fixtures
@@ -66,26 +62,20 @@ ACTIVITY_ESTIMATE_EXPECTED = [
 ]
 
 
-def test_activity_estimate_output_matches_expected(test_out_dir):
+def test_activity_estimate_output_matches_expected(run_automation):
     """
-    Run tool explicitly on ActivityEstimate XML and compare to reference fixtures.
-    This test is self-contained (does not rely on parametrized run order).
+    Run tool on ActivityEstimate XML and compare to reference fixtures.
+    This test is self-contained: it reuses the bulk run's output if there was one, else runs the tool.
     """
     xml_path = TEST_DIR / "translationDb_ActivityEstimate-Cust.xml"
     if not xml_path.exists():
         pytest.skip("translationDb_ActivityEstimate-Cust.xml not found")
 
-    automation = IFSLanguageAutomation(
-        xml_path=str(xml_path),
-        output_dir=str(test_out_dir),
-        languages=["sv-SE", "nb-NO"],
-        translation_backend="dictionary",
-    )
-    automation.run()
+    out_dir = run_automation(xml_path, languages=["sv-SE", "nb-NO"], backend="dictionary")
 
     for basename in ACTIVITY_ESTIMATE_EXPECTED:
         expected_path = TEST_DIR / basename
-        generated_path = test_out_dir / basename
+        generated_path = out_dir / basename
         if not expected_path.exists():
             pytest.skip(f"Expected fixture missing: {expected_path}")
         assert generated_path.exists(), f"Generated file missing: {generated_path}"
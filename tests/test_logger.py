@@ -0,0 +1,21 @@
+"""
+Tests for the automation logger.
+Verifies that console echoes follow sys.stdout redirection made after construction.
+"""
+
+import contextlib
+import io
+
+# conftest adds src to path
+from logger import IFSLogger
+
+
+def test_echo_follows_stdout_redirected_after_construction(tmp_path, capsys):
+    logger = IFSLogger(tmp_path / "Log.txt")
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        logger.info("redirected")
+    logger.warning("captured")
+
+    assert buffer.getvalue().endswith("[INFO] redirected\n")
+    assert capsys.readouterr().out.endswith("[WARN] captured\n")
@@ -0,0 +1,216 @@
+"""
+Tests for the XML parser.
+Verifies that statistics and filtered output follow the final LU/view dicts when controls or IDs repeat.
+"""
+
+import xml.etree.ElementTree as StdET
+
+import pytest
+
+# conftest adds src to path
+import parser as parser_module
+from parser import IFSXMLParser
+from trs_generator import TRSGenerator
+
+
+# A later View with the same control (or LU with the same ID) replaces the earlier one
+DUPLICATE_CONTROLS_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<TranslatableResources type="LU" module="PROJ" version="1.0" layer="Cust" xmlns="types.scan.translation.fnd.ifsworld.com">
+   <TranslatableResource type="Logical Unit" ID="Alpha" name="Alpha">
+      <Text><![CDATA[Alpha]]></Text>
+      <Resource subtype="View" ID="Alpha.V1" control="V1">
+         <Text><![CDATA[View One]]></Text>
+         <Resource subtype="Column" ID="Alpha.V1.C_ONE" control="C_ONE"><Text><![CDATA[Alpha One]]></Text></Resource>
+         <Resource subtype="Column" ID="Alpha.V1.C_TWO" control="C_TWO"><Text><![CDATA[]]></Text></Resource>
+         <Resource subtype="Column" ID="Alpha.V1.STD1" control="STD1"><Text><![CDATA[Std One]]></Text></Resource>
+      </Resource>
+      <Resource subtype="View" ID="Alpha.V2" control="V2">
+         <Text><![CDATA[View Two]]></Text>
+         <Resource subtype="Column" ID="Alpha.V2.C_GONE" control="C_GONE"><Text><![CDATA[Gone]]></Text></Resource>
+      </Resource>
+      <Resource subtype="View" ID="Alpha.V1" control="V1">
+         <Text><![CDATA[View One]]></Text>
+         <Resource subtype="Column" ID="Alpha.V1.C_ONE" control="C_ONE"><Text><![CDATA[Zed]]></Text></Resource>
+         <Resource subtype="Column" ID="Alpha.V1.STD1" control="STD1"><Text><![CDATA[Std One]]></Text></Resource>
+         <Resource subtype="Column" ID="Alpha.V1.STD2" control="STD2"><Text><![CDATA[Std Two]]></Text></Resource>
+      </Resource>
+      <Resource subtype="View" ID="Alpha.V2" control="V2">
+         <Text><![CDATA[View Two]]></Text>
+         <Resource subtype="Column" ID="Alpha.V2.STD3" control="STD3"><Text><![CDATA[Std Three]]></Text></Resource>
+      </Resource>
+   </TranslatableResource>
+   <TranslatableResource type="Logical Unit" ID="Beta" name="Beta">
+      <Text><![CDATA[Beta]]></Text>
+      <Resource subtype="View" ID="Beta.V3" control="V3">
+         <Text><![CDATA[View Three]]></Text>
+         <Resource subtype="Column" ID="Beta.V3.C_X" control="C_X"><Text><![CDATA[Alpha2]]></Text></Resource>
+      </Resource>
+   </TranslatableResource>
+   <TranslatableResource type="Logical Unit" ID="Beta" name="Beta">
+      <Text><![CDATA[Beta]]></Text>
+      <Resource subtype="View" ID="Beta.V3" control="V3">
+         <Text><![CDATA[View Three]]></Text>
+         <Resource subtype="Column" ID="Beta.V3.C_Y" control="C_Y"><Text><![CDATA[Q — ü]]></Text></Resource>
+         <Resource subtype="Column" ID="Beta.V3.STD4" control="STD4"><Text><![CDATA[Std Four]]></Text></Resource>
+      </Resource>
+   </TranslatableResource>
+</TranslatableResources>
+"""
+
+# Statistics of the unfiltered parse (get_statistics over parse() before custom_only existed)
+EXPECTED_STATS = {
+    "total_logical_units": 2,
+    "total_views": 3,
+    "total_columns": 6,
+    "custom_columns": 2,
+    "standard_columns": 4,
+}
+
+# Several LUs, comments and a processing instruction between them, and a
+# TranslatableResource nested below a View that must not be read as an LU
+MULTI_LU_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<TranslatableResources type="LU" module="PROJ" version="1.0" layer="Cust" xmlns="types.scan.translation.fnd.ifsworld.com">
+   <!-- first -->
+   <TranslatableResource type="Logical Unit" ID="One" name="One">
+      <Text><![CDATA[One]]></Text>
+      <Resource subtype="View" ID="One.V" control="V">
+         <Text><![CDATA[View]]></Text>
+         <Resource subtype="Column" ID="One.V.C_A" control="C_A"><Text><![CDATA[ Label A ]]></Text></Resource>
+         <Resource subtype="Column" ID="One.V.STD" control="STD"><Text><![CDATA[Std]]></Text></Resource>
+         <TranslatableResource type="Logical Unit" ID="Nested" name="Nested">
+            <Resource subtype="View" ID="Nested.V" control="NV">
+               <Resource subtype="Column" ID="Nested.V.C_N" control="C_N"><Text><![CDATA[Nested]]></Text></Resource>
+            </Resource>
+         </TranslatableResource>
+      </Resource>
+   </TranslatableResource>
+   <?ifs note?>
+   <TranslatableResource type="Logical Unit" ID="Two" name="Two">
+      <Text><![CDATA[Two]]></Text>
+      <Resource subtype="View" ID="Two.V" control="V">
+         <Resource subtype="Column" ID="Two.V.C_B" control="C_B"><Text><![CDATA[Label B]]></Text></Resource>
+      </Resource>
+   </TranslatableResource>
+   <TranslatableResource type="Logical Unit" ID="Three" name="Three">
+      <Resource subtype="View" ID="Three.V" control="V">
+         <Resource subtype="Column" ID="Three.V.STD" control="STD"><Text><![CDATA[Std]]></Text></Resource>
+      </Resource>
+   </TranslatableResource>
+</TranslatableResources>
+"""
+
+# Internal entities are expanded by both parse paths
+ENTITY_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE TranslatableResources [
+   <!ENTITY brand "Acme">
+]>
+<TranslatableResources type="LU" module="PROJ" version="1.0" layer="Cust" xmlns="types.scan.translation.fnd.ifsworld.com">
+   <TranslatableResource type="Logical Unit" ID="One" name="One">
+      <Resource subtype="View" ID="One.V" control="V">
+         <Resource subtype="Column" ID="One.V.C_A" control="C_A"><Text>&brand; Cost</Text></Resource>
+      </Resource>
+   </TranslatableResource>
+</TranslatableResources>
+"""
+
+# External entities must never be loaded into labels
+EXTERNAL_ENTITY_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE TranslatableResources [
+   <!ENTITY secret SYSTEM "%s">
+]>
+<TranslatableResources type="LU" module="PROJ" version="1.0" layer="Cust" xmlns="types.scan.translation.fnd.ifsworld.com">
+   <TranslatableResource type="Logical Unit" ID="One" name="One">
+      <Resource subtype="View" ID="One.V" control="V">
+         <Resource subtype="Column" ID="One.V.C_A" control="C_A"><Text>Label &secret;</Text></Resource>
+      </Resource>
+   </TranslatableResource>
+</TranslatableResources>
+"""
+
+
+@pytest.fixture
+def duplicate_xml(tmp_path):
+    path = tmp_path / "translationDb_Duplicates-Cust.xml"
+    path.write_text(DUPLICATE_CONTROLS_XML, encoding="utf-8")
+    return path
+
+
+def test_stats_match_final_views(duplicate_xml):
+    """parser.stats counts only the views and LUs that survive replacement."""
+    parser = IFSXMLParser(duplicate_xml)
+    data = parser.parse()
+    assert parser.stats == parser.get_statistics(data)
+    assert parser.stats == EXPECTED_STATS
+
+
+def test_custom_only_stats_and_views_match_unfiltered_parse(duplicate_xml):
+    """custom_only keeps whole-document stats and matches extract_custom_fields of the full parse."""
+    full_parser = IFSXMLParser(duplicate_xml)
+    expected = full_parser.extract_custom_fields(full_parser.parse())
+    
+    parser = IFSXMLParser(duplicate_xml, custom_only=True)
+    data = parser.parse()
+    assert parser.stats == EXPECTED_STATS
+    assert data == expected
+    assert {lu_id: list(lu["views"]) for lu_id, lu in data["logical_units"].items()} == {
+        "Alpha": ["V1"],
+        "Beta": ["V3"],
+    }
+
+
+@pytest.mark.parametrize("custom_only", [False, True])
+def test_unique_labels_come_from_final_views(duplicate_xml, custom_only):
+    """Labels of replaced views are not collected for translation."""
+    parser = IFSXMLParser(duplicate_xml, custom_only=custom_only)
+    data = parser.parse()
+    assert parser.unique_labels == {"Zed", "Q — ü"}
+    assert parser.unique_labels == set(TRSGenerator.collect_labels(parser.extract_custom_fields(data)))
+
+
+@pytest.mark.parametrize(
+    "xml_text, lu_count",
+    [(MULTI_LU_XML, 3), (DUPLICATE_CONTROLS_XML, 2), (ENTITY_XML, 1)],
+    ids=["multi_lu", "duplicates", "internal_entity"],
+)
+@pytest.mark.parametrize("custom_only", [False, True])
+def test_lxml_and_stdlib_parsers_agree(tmp_path, monkeypatch, xml_text, lu_count, custom_only):
+    """The lxml streaming path returns the same data, stats and labels as the stdlib path."""
+    pytest.importorskip("lxml")
+    path = tmp_path / "translationDb_Multi-Cust.xml"
+    path.write_text(xml_text, encoding="utf-8")
+
+    def parse():
+        parser = IFSXMLParser(path, custom_only=custom_only)
+        return parser.parse(), parser.stats, parser.unique_labels, dict(parser.root.attrib)
+
+    assert parser_module.HAS_LXML
+    lxml_result = parse()
+    # Force the xml.etree fallback for the second parse
+    monkeypatch.setattr(parser_module, "HAS_LXML", False)
+    monkeypatch.setattr(parser_module, "ET", StdET)
+    std_result = parse()
+
+    assert lxml_result == std_result
+    data = std_result[0]
+    assert "Nested" not in data["logical_units"]
+    assert std_result[1]["total_logical_units"] == lu_count
+
+
+@pytest.mark.parametrize("use_lxml", [True, False], ids=["lxml", "stdlib"])
+def test_external_entities_are_not_resolved(tmp_path, monkeypatch, use_lxml):
+    """A SYSTEM entity pointing at a local file is rejected instead of leaking its contents into labels."""
+    if use_lxml:
+        pytest.importorskip("lxml")
+        assert parser_module.HAS_LXML
+    else:
+        monkeypatch.setattr(parser_module, "HAS_LXML", False)
+        monkeypatch.setattr(parser_module, "ET", StdET)
+    secret = tmp_path / "secret.txt"
+    secret.write_text("SECRET-CONTENT", encoding="utf-8")
+    path = tmp_path / "translationDb_Entity-Cust.xml"
+    path.write_text(EXTERNAL_ENTITY_XML % secret.as_uri(), encoding="utf-8")
+
+    parser = IFSXMLParser(path, custom_only=True)
+    with pytest.raises(SyntaxError, match="secret"):
+        parser.parse()
+    assert not parser.unique_labels
@@ -0,0 +1,112 @@
+"""
+Tests for the persistent (SQLite) translation cache used by network backends.
+Groq and Google Translate are replaced by the stub_groq and stub_google fixtures, so nothing leaves the machine.
+"""
+
+import pytest
+
+# conftest adds src to path
+from translator import IFSTranslator, PersistentTranslationCache
+
+
+LABELS = ["Actual Cost", "Branch No", "Widget Colour"]
+
+
+def _google(cache_path, **kwargs):
+    return IFSTranslator(backend="google", cache_path=cache_path, **kwargs)
+
+
+def test_warm_run_sends_nothing(tmp_path, stub_google):
+    """A second translator on the same cache file serves every label from disk."""
+    cache_path = tmp_path / "cache.sqlite"
+    cold = _google(cache_path)
+    first = cold.translate_batch(LABELS, "sv-SE")
+    cold.close()
+    assert stub_google.requests == [LABELS]
+
+    warm = _google(cache_path)
+    assert warm.translate_batch(LABELS, "sv-SE") == first
+    warm.close()
+    assert stub_google.requests == [LABELS]
+
+
+def test_dictionary_fallback_is_not_persisted(tmp_path, stub_google):
+    """Labels answered by the dictionary after a backend failure are retried on the next run."""
+    cache_path = tmp_path / "cache.sqlite"
+    stub_google.fail = True
+    translator = _google(cache_path)
+    result = translator.translate_batch(["Branch No", "Widget Colour"], "sv-SE")
+    translator.close()
+    assert result == {"Branch No": "Filialnummer", "Widget Colour": "Widget Colour"}
+
+    cache = PersistentTranslationCache(cache_path)
+    assert cache.get_many("sv-SE", ["Branch No", "Widget Colour"]) == {}
+    cache.close()
+
+
+@pytest.mark.parametrize("bad_value", ["null", "42", "[\"Widget\"]", "{\"sv\": \"Sak\"}"])
+def test_non_string_groq_value_is_not_persisted(tmp_path, stub_groq, bad_value):
+    """A null or non-string value in the Groq reply falls back to the original label and is never cached."""
+    cache_path = tmp_path / "cache.sqlite"
+    stub_groq.reply = '{"Widget": %s, "Gadget": "Pryl"}' % bad_value
+    translator = IFSTranslator(backend="groq", api_key="test", cache_path=cache_path)
+    result = translator.translate_batch(["Widget", "Gadget"], "sv-SE")
+    translator.close()
+    assert result == {"Widget": "Widget", "Gadget": "Pryl"}
+
+    cache = PersistentTranslationCache(cache_path)
+    assert cache.get_many("sv-SE", ["Widget", "Gadget"]) == {"Gadget": "Pryl"}
+    cache.close()
+
+    # The next run asks for the label again instead of reusing a bad value from disk
+    warm = IFSTranslator(backend="groq", api_key="test", cache_path=cache_path)
+    warm.translate_batch(["Widget", "Gadget"], "sv-SE")
+    warm.close()
+    assert len(stub_groq.requests) == 2
+    assert '"Gadget"' not in stub_groq.requests[1]
+
+
+def test_refresh_cache_resends_and_overwrites(tmp_path, stub_google):
+    cache_path = tmp_path / "cache.sqlite"
+    cache = PersistentTranslationCache(cache_path)
+    cache.put_many("sv-SE", {"Actual Cost": "bad"})
+    cache.close()
+
+    translator = _google(cache_path, refresh_cache=True)
+    assert translator.translate_batch(["Actual Cost"], "sv-SE") == {"Actual Cost": "sv:Actual Cost"}
+    translator.close()
+    assert stub_google.requests == [["Actual Cost"]]
+
+    cache = PersistentTranslationCache(cache_path)
+    assert cache.get_many("sv-SE", ["Actual Cost"]) == {"Actual Cost": "sv:Actual Cost"}
+    cache.close()
+
+
+def test_disabled_cache_creates_no_file(tmp_path, stub_google):
+    cache_path = tmp_path / "cache.sqlite"
+    translator = _google(cache_path, use_persistent_cache=False)
+    translator.translate_batch(LABELS, "sv-SE")
+    translator.close()
+    assert translator.persistent_cache is None
+    assert not cache_path.exists()
+
+
+def test_close_is_idempotent(tmp_path, stub_google):
+    translator = _google(tmp_path / "cache.sqlite")
+    translator.close()
+    translator.close()
+
+    cache = PersistentTranslationCache(tmp_path / "other.sqlite")
+    cache.close()
+    cache.close()
+
+
+def test_lookups_above_query_chunk_size(tmp_path):
+    """get_many splits IN (...) queries, so more labels than SQLite variables still round-trip."""
+    count = PersistentTranslationCache._QUERY_CHUNK * 2 + 7
+    translations = {f"Label {i}": f"Etikett {i}" for i in range(count)}
+    cache = PersistentTranslationCache(tmp_path / "cache.sqlite")
+    cache.put_many("sv-SE", translations)
+    assert cache.get_many("sv-SE", list(translations) + ["Missing"]) == translations
+    assert cache.get_many("nb-NO", list(translations)) == {}
+    cache.close()
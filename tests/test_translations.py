@@ -49,6 +49,17 @@ def test_dictionary_translations_norwegian(translator):
         assert result.get(eng) == expected, f"nb-NO: {eng!r} -> {result.get(eng)!r}"
 
 
+def test_dictionary_translations_multilang(translator):
+    """One translate_batch_multilang call returns both languages' dictionary translations."""
+    expected = {"sv-SE": EXPECTED_SWEDISH, "nb-NO": EXPECTED_NORWEGIAN}
+    labels = list(dict.fromkeys(label for mapping in expected.values() for label in mapping))
+    results = translator.translate_batch_multilang(labels, list(expected))
+    assert list(results) == list(expected)
+    for lang, mapping in expected.items():
+        for eng, translated in mapping.items():
+            assert results[lang].get(eng) == translated, f"{lang}: {eng!r} -> {results[lang].get(eng)!r}"
+
+
 def test_dictionary_unknown_label_returns_original(translator):
     """Labels not in dictionary are returned unchanged (fallback)."""
     result = translator.translate_batch(["Unknown Label XYZ"], "sv-SE")
@@ -63,3 +74,49 @@ def test_dictionary_batch_includes_all_inputs(translator):
     result = translator.translate_batch(labels, "sv-SE")
     assert len(result) == len(labels)
     assert set(result.keys()) == set(labels)
+
+
+def test_network_backend_passes_codes_through(stub_google, tmp_path):
+    """All-caps and numeric labels map to themselves and are never sent to the backend."""
+    translator = IFSTranslator(backend="google", cache_path=tmp_path / "cache.sqlite")
+    codes = ["EAN", "UOM", "GTIN-13", "2024", "ACTUAL COST", "ID (EXT)"]
+    result = translator.translate_batch(codes + ["Actual Cost", "Ean code"], "sv-SE")
+    translator.close()
+    assert {code: result[code] for code in codes} == {code: code for code in codes}
+    assert result["Actual Cost"] == "sv:Actual Cost"
+    assert stub_google.requests == [["Actual Cost", "Ean code"]]
+
+
+def test_batch_strips_and_deduplicates_labels(stub_google):
+    """Whitespace variants translate like the stripped label, each distinct label is sent once,
+    and the result keeps every original key."""
+    translator = IFSTranslator(backend="google", use_persistent_cache=False)
+    labels = [" Branch No ", "Branch No", "Branch No\t", "Widget", "Widget"]
+    result = translator.translate_batch(labels, "nb-NO")
+    assert stub_google.requests == [["Branch No", "Widget"]]
+    assert result == {
+        " Branch No ": "nb:Branch No",
+        "Branch No": "nb:Branch No",
+        "Branch No\t": "nb:Branch No",
+        "Widget": "nb:Widget",
+    }
+
+
+def test_dictionary_batch_strips_whitespace(translator):
+    result = translator.translate_batch([" Actual Cost ", "Actual Cost"], "sv-SE")
+    assert result == {" Actual Cost ": "Verklig kostnad", "Actual Cost": "Verklig kostnad"}
+
+
+def test_memory_cache_evicts_least_recently_used(stub_google):
+    """Hits refresh a label's recency; the oldest label is evicted past CACHE_MAX_ENTRIES."""
+    translator = IFSTranslator(backend="google", use_persistent_cache=False)
+    translator.CACHE_MAX_ENTRIES = 3
+    translator.translate_batch(["Alpha", "Beta", "Gamma"], "sv-SE")
+    translator.translate_batch(["Alpha"], "sv-SE")
+    translator.translate_batch(["Delta"], "sv-SE")
+    assert list(translator.translation_cache["sv-SE"]) == ["Gamma", "Alpha", "Delta"]
+
+    assert translator.translate_single("Alpha", "sv-SE") == "sv:Alpha"
+    translator.translate_batch(["Beta"], "sv-SE")
+    assert stub_google.requests == [["Alpha", "Beta", "Gamma"], ["Delta"], ["Beta"]]
+    assert list(translator.translation_cache["sv-SE"]) == ["Delta", "Alpha", "Beta"]
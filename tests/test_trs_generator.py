@@ -0,0 +1,39 @@
+"""
+Tests for the .trs generator.
+Verifies label collection for the single translate_batch call and translation fallbacks.
+"""
+
+# conftest adds src to path
+from trs_generator import TRSGenerator
+
+
+def _view(*labels):
+    return {
+        "col_ids": [f"ID_{i}" for i in range(len(labels))],
+        "col_controls": [f"C_COL_{i}" for i in range(len(labels))],
+        "col_labels": list(labels),
+    }
+
+
+def test_collect_labels_first_seen_order_without_duplicates():
+    """Labels are deduplicated across views and LUs and keep first-seen order."""
+    data = {
+        "logical_units": {
+            "Second": {"views": {"V1": _view("Zed", "Actual Cost"), "V2": _view("Actual Cost", "")}},
+            "First": {"views": {"V3": _view("Alpha", "Zed")}},
+        }
+    }
+    assert TRSGenerator.collect_labels(data) == ["Zed", "Actual Cost", "", "Alpha"]
+
+
+def test_collect_labels_empty_tree():
+    assert TRSGenerator.collect_labels({"logical_units": {}}) == []
+
+
+def test_non_string_translation_keeps_original_label():
+    """A None (or other non-string) translation is written as the English label instead of crashing."""
+    data = {"logical_units": {"Lu": {"name": "Lu", "views": {"V": {"control": "V", **_view("Widget", "Gadget")}}}}}
+    generator = TRSGenerator("PROJ", "Cust", "sv-SE")
+    content = generator.generate_content(data, {"Widget": None, "Gadget": 42})
+    assert "\t\tA:Prompt^Widget^\r\n" in content
+    assert "\t\tA:Prompt^Gadget^\r\n" in content
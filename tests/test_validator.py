@@ -0,0 +1,149 @@
+"""
+Tests for the .lng/.trs validator.
+Covers the opt-in result cache, fast_fail early exits and the shared check() instances.
+"""
+
+import os
+
+import pytest
+
+# conftest adds src to path
+from validator import IFSValidator
+
+
+LNG_HEADER = (
+    "-------------------------------------------------------\r\n"
+    "File Type: IFS Foundation Language File\r\n"
+    "Type version: 10.00\r\n"
+    "-------------------------------------------------------\r\n"
+    "Module: PROJ\r\n"
+    "Layer: Cust\r\n"
+    "Main Type: LU\r\n"
+    "Sub Type: Logical Unit\r\n"
+    "Content: \r\n"
+    "-------------------------------------------------------\r\n"
+)
+
+VALID_LNG_BODY = (
+    "CS:ActivityEstimate^LU^Logical Unit^N^N\r\n"
+    "\tA:Prompt^Activity Estimate^\r\n"
+    "\tCS:VIEW^LU^View^N^N\r\n"
+    "\t\tCS:C_COST^LU^Column^N^N\r\n"
+    "\t\t\tA:Prompt^C Cost^\r\n"
+    "\t\tCE:\r\n"
+    "\tCE:\r\n"
+    "CE:\r\n"
+)
+
+# Same size as VALID_LNG_BODY, with the last CE: turned into an unclosed block
+UNCLOSED_LNG_BODY = VALID_LNG_BODY[:-len("CE:\r\n")] + "XX:\r\n"
+
+
+@pytest.fixture
+def lng_file(tmp_path):
+    path = tmp_path / "Proj_LU_LogicalUnit-Cust.lng"
+    path.write_bytes((LNG_HEADER + VALID_LNG_BODY).encode("utf-8"))
+    return path
+
+
+def _rewrite_keeping_stat(path, body):
+    """Replace the content without changing size or mtime, as a rewrite within one mtime tick would."""
+    st = path.stat()
+    path.write_bytes((LNG_HEADER + body).encode("utf-8"))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def test_cached_result_is_reused(lng_file, monkeypatch):
+    validator = IFSValidator(cache_results=True)
+    first = validator.validate_file(str(lng_file))
+    assert first[0]
+
+    calls = []
+    monkeypatch.setattr(validator, "_validate_file_uncached", lambda *args: calls.append(args))
+    assert validator.validate_file(str(lng_file)) == first
+    # Another caching validator shares the results
+    assert IFSValidator(cache_results=True).validate_file(str(lng_file)) == first
+    assert calls == []
+
+
+def test_cache_is_invalidated_by_new_mtime(lng_file):
+    validator = IFSValidator(cache_results=True)
+    assert validator.validate_file(str(lng_file))[0]
+
+    st = lng_file.stat()
+    lng_file.write_bytes((LNG_HEADER + UNCLOSED_LNG_BODY).encode("utf-8"))
+    os.utime(lng_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    is_valid, errors, _ = validator.validate_file(str(lng_file))
+    assert not is_valid
+    assert errors == ["Line 11: CS 'ActivityEstimate' not closed with CE"]
+
+
+def test_default_validator_does_not_cache(lng_file):
+    validator = IFSValidator()
+    IFSValidator(cache_results=True).validate_file(str(lng_file))
+    assert validator.validate_file(str(lng_file))[0]
+
+    # Same size and mtime: only an uncached validator sees the new content
+    _rewrite_keeping_stat(lng_file, UNCLOSED_LNG_BODY)
+    assert not validator.validate_file(str(lng_file))[0]
+    assert not IFSValidator.check(str(lng_file))[0]
+
+
+def _write_lng(tmp_path, text):
+    path = tmp_path / "Broken_LU_LogicalUnit-Cust.lng"
+    path.write_bytes(text.encode("utf-8"))
+    return path
+
+
+def test_fast_fail_stops_at_first_header_error(tmp_path):
+    """Wrong file type and missing fields: only the first header error, and content is not checked."""
+    header = LNG_HEADER.replace("Language File", "Translation File").replace("Module: PROJ\r\n", "")
+    path = _write_lng(tmp_path, header + UNCLOSED_LNG_BODY)
+
+    is_valid, errors, _ = IFSValidator().validate_file(str(path), fast_fail=True)
+    assert not is_valid
+    assert errors == ["Invalid file type header. Expected: IFS Foundation Language File"]
+
+    # Without fast_fail every problem is reported
+    _, all_errors, _ = IFSValidator().validate_file(str(path))
+    assert all_errors[:2] == [
+        "Invalid file type header. Expected: IFS Foundation Language File",
+        "Missing required header field: Module:",
+    ]
+    assert len(all_errors) > 2
+
+
+def test_fast_fail_stops_at_mid_file_ce_mismatch(tmp_path):
+    """A stray CE: mid-file is the only error; later structure errors and unclosed blocks are skipped."""
+    body = (
+        "CS:ActivityEstimate^LU^Logical Unit^N^N\r\n"
+        "\tCE:\r\n"
+        "CE:\r\n"
+        "CE:\r\n"
+        "CS:Second^LU^Bad\r\n"
+        "\tA:Prompt^No caret\r\n"
+    )
+    path = _write_lng(tmp_path, LNG_HEADER + body)
+
+    is_valid, errors, _ = IFSValidator().validate_file(str(path), fast_fail=True)
+    assert not is_valid
+    assert errors == ["Line 13: CE without matching CS"]
+
+    _, all_errors, _ = IFSValidator().validate_file(str(path))
+    assert all_errors[0] == "Line 13: CE without matching CS"
+    assert len(all_errors) > 1
+
+
+class StrictValidator(IFSValidator):
+    """Subclass with an extra header rule, to check that check() uses the calling class."""
+
+    def _validate_header(self, lines, is_lng, fast_fail=False):
+        super()._validate_header(lines, is_lng, fast_fail)
+        self.errors.append("Strict: extra rule")
+
+
+def test_check_uses_a_shared_instance_per_class(lng_file):
+    assert IFSValidator.check(str(lng_file)) == (True, [], [])
+    assert StrictValidator.check(str(lng_file)) == (False, ["Strict: extra rule"], [])
+    # The base class is unaffected by the subclass instance
+    assert IFSValidator.check(str(lng_file))[0]